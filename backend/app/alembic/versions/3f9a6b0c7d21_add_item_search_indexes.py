@@ -0,0 +1,52 @@
+"""Add item search indexes
+
+Revision ID: 3f9a6b0c7d21
+Revises: e8b27c5d1f93
+Create Date: 2026-10-18 16:48:13.204971
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '3f9a6b0c7d21'
+down_revision = 'e8b27c5d1f93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    # A stored generated column rewrites the table once
+    op.add_column('item', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed(
+            "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(description, '')), 'B')",
+            persisted=True,
+        ),
+        nullable=True,
+    ))
+    # CONCURRENTLY doesn't block writes but can't run inside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_item_search_vector', 'item', ['search_vector'], unique=False,
+            postgresql_using='gin', postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_item_title_trgm', 'item', ['title'], unique=False,
+            postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'},
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_item_title_trgm', table_name='item', postgresql_concurrently=True)
+        op.drop_index('ix_item_search_vector', table_name='item', postgresql_concurrently=True)
+    op.drop_column('item', 'search_vector')
+    # pg_trgm is left installed, other objects may depend on it
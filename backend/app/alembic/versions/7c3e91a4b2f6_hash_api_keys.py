@@ -0,0 +1,85 @@
+"""Hash API keys at rest
+
+Revision ID: 7c3e91a4b2f6
+Revises: d5cf56b8fc6a
+Create Date: 2026-10-18 12:40:07.913524
+
+"""
+import hashlib
+import hmac
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+from app.core.config import settings
+
+
+# revision identifiers, used by Alembic.
+revision = '7c3e91a4b2f6'
+down_revision = 'd5cf56b8fc6a'
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 1000
+PREFIX_LENGTH = 8
+
+api_keys = sa.table(
+    'api_keys',
+    sa.column('id', sa.UUID()),
+    sa.column('key', sa.String()),
+    sa.column('key_hash', sa.String()),
+    sa.column('key_prefix', sa.String()),
+)
+
+
+def upgrade():
+    op.add_column('api_keys', sa.Column('key_hash', sa.String(length=64), nullable=True))
+    op.add_column('api_keys', sa.Column('key_prefix', sa.String(length=16), nullable=True))
+
+    # Same HMAC as app.core.security.hash_api_key, copied so the migration
+    # doesn't change if that code does
+    pepper = (settings.API_KEY_PEPPER or settings.SECRET_KEY).encode()
+    conn = op.get_bind()
+    update = (
+        api_keys.update()
+        .where(api_keys.c.id == sa.bindparam('b_id'))
+        .values(key_hash=sa.bindparam('b_hash'), key_prefix=sa.bindparam('b_prefix'))
+    )
+    while True:
+        rows = conn.execute(
+            sa.select(api_keys.c.id, api_keys.c.key)
+            .where(api_keys.c.key_hash.is_(None))
+            .limit(BATCH_SIZE)
+        ).all()
+        if not rows:
+            break
+        conn.execute(
+            update,
+            [
+                {
+                    'b_id': row.id,
+                    'b_hash': hmac.new(pepper, row.key.encode(), hashlib.sha256).hexdigest(),
+                    'b_prefix': row.key[:PREFIX_LENGTH],
+                }
+                for row in rows
+            ],
+        )
+
+    op.alter_column('api_keys', 'key_hash', nullable=False)
+    op.alter_column('api_keys', 'key_prefix', nullable=False)
+    op.create_index(op.f('ix_api_keys_key_hash'), 'api_keys', ['key_hash'], unique=True)
+    op.drop_index('ix_api_keys_key', table_name='api_keys')
+    op.drop_column('api_keys', 'key')
+
+
+def downgrade():
+    # Plain keys can't be recovered: the hash takes their place, so keys
+    # have to be reissued after downgrading
+    op.add_column('api_keys', sa.Column('key', sa.String(), nullable=True))
+    op.execute(api_keys.update().values(key=api_keys.c.key_hash))
+    op.alter_column('api_keys', 'key', nullable=False)
+    op.create_index('ix_api_keys_key', 'api_keys', ['key'], unique=True)
+    op.drop_index(op.f('ix_api_keys_key_hash'), table_name='api_keys')
+    op.drop_column('api_keys', 'key_prefix')
+    op.drop_column('api_keys', 'key_hash')
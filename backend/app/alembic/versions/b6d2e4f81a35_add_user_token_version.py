@@ -0,0 +1,26 @@
+"""Add user token version
+
+Revision ID: b6d2e4f81a35
+Revises: 3f9a6b0c7d21
+Create Date: 2026-10-18 19:05:12.640218
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6d2e4f81a35'
+down_revision = '3f9a6b0c7d21'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # A constant default doesn't rewrite the table
+    op.add_column('user', sa.Column('token_version', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade():
+    op.drop_column('user', 'token_version')
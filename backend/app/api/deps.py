@@ -1,9 +1,10 @@
+import uuid
 from collections.abc import AsyncGenerator
 from datetime import datetime
 from typing import Annotated
 
 import jwt
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Query, Request, status
 from fastapi.security import APIKeyHeader, OAuth2PasswordBearer
 from jwt.exceptions import InvalidTokenError
 from pydantic import ValidationError
@@ -11,11 +12,18 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core import security
 from app.core.config import settings
-from app.crud.api_key import api_crud
-from app.db.session import AsyncSessionLocal
+from app.core.rate_limit import rate_limit_backend
+from app.crud.api_key import (
+    api_crud,
+    api_key_cache,
+    api_key_usage,
+    cache_api_key,
+)
+from app.crud.user import user_crud
+from app.db.session import AsyncSessionLocal, read_session
 from app.models.api_key import APIKey
 from app.models.user import User
-from app.schemas.common import TokenPayload
+from app.schemas.common import Principal, TokenPayload
 
 reusable_oauth2 = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_STR}/login/access-token"
@@ -27,24 +35,102 @@ api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with AsyncSessionLocal() as session:
         yield session
+        # not reached when the endpoint raises, which rolls back; a
+        # ROLLBACK would also drop the prepared statements (see read_session)
+        await session.commit()
+
+
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    async with read_session() as session:
+        yield session
 
 
 SessionDep = Annotated[AsyncSession, Depends(get_db)]
+ReadSessionDep = Annotated[AsyncSession, Depends(get_read_db)]
 TokenDep = Annotated[str, Depends(reusable_oauth2)]
 
+# Largest page the list endpoints return
+MAX_PAGE_LIMIT = 1000
+PageLimit = Annotated[int, Query(ge=1, le=MAX_PAGE_LIMIT)]
+PageSkip = Annotated[int, Query(ge=0)]
+
 
-async def get_current_user(session: SessionDep, token: TokenDep) -> User:
+def _decode_token(token: str) -> tuple[uuid.UUID, TokenPayload]:
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[security.ALGORITHM]
         )
         token_data = TokenPayload(**payload)
-    except (InvalidTokenError, ValidationError):
+        user_id = uuid.UUID(token_data.sub)
+    except (InvalidTokenError, ValidationError, TypeError, ValueError):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
         )
-    user = await session.get(User, token_data.sub)
+    return user_id, token_data
+
+
+async def check_rate_limit(request: Request, key: str, per_minute: int) -> None:
+    """
+    Take a token from the bucket of ``key``; the result is left on
+    ``request.state`` for RateLimitHeadersMiddleware.
+    """
+    if not settings.RATE_LIMIT_ENABLED or per_minute <= 0:
+        return
+    result = await rate_limit_backend.acquire(key, per_minute)
+    request.state.rate_limit = result
+    if not result.allowed:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Rate limit exceeded",
+            headers=result.headers(),
+        )
+
+
+async def get_current_principal(
+    request: Request, session: SessionDep, token: TokenDep
+) -> Principal:
+    user_id, token_data = _decode_token(token)
+    await check_rate_limit(
+        request, f"user:{user_id}", settings.RATE_LIMIT_USER_PER_MINUTE
+    )
+    if (
+        settings.JWT_STATELESS_AUTH
+        and token_data.ver is not None
+        and token_data.is_active is not None
+        and token_data.is_superuser is not None
+    ):
+        version = await user_crud.get_token_version(session, user_id)
+        if version is None or token_data.ver < version:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Token has been revoked",
+            )
+        principal = Principal(
+            id=user_id,
+            is_active=token_data.is_active,
+            is_superuser=token_data.is_superuser,
+        )
+    else:
+        user = await session.get(User, user_id)
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+        # The identity map only holds weak references; keep the user alive
+        # so get_current_user doesn't load it again
+        session.info["current_user"] = user
+        principal = Principal.model_validate(user)
+    if not principal.is_active:
+        raise HTTPException(status_code=400, detail="Inactive user")
+    return principal
+
+
+CurrentPrincipal = Annotated[Principal, Depends(get_current_principal)]
+
+
+async def get_current_user(session: SessionDep, principal: CurrentPrincipal) -> User:
+    # Served from the session identity map when the principal was loaded
+    # from the DB, so this only costs a query in stateless mode
+    user = await session.get(User, principal.id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     if not user.is_active:
@@ -55,31 +141,60 @@ async def get_current_user(session: SessionDep, token: TokenDep) -> User:
 CurrentUser = Annotated[User, Depends(get_current_user)]
 
 
-def get_current_active_superuser(current_user: CurrentUser) -> User:
-    if not current_user.is_superuser:
+def get_current_active_superuser(principal: CurrentPrincipal) -> Principal:
+    if not principal.is_superuser:
         raise HTTPException(
             status_code=403, detail="The user doesn't have enough privileges"
         )
-    return current_user
+    return principal
+
+
+_CACHE_MISS = object()
 
 
 async def get_api_key_record(
-    session: SessionDep, api_key: Annotated[str | None, Depends(api_key_header)]
+    request: Request,
+    api_key: Annotated[str | None, Depends(api_key_header)],
 ) -> APIKey:
     if not api_key:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, detail="API key missing"
         )
 
-    key_obj = await api_crud.get(session, api_key)
+    key_hash = security.hash_api_key(api_key)
+    # Cache hits (positive or negative) are answered without a DB session
+    cached = api_key_cache.get(key_hash, _CACHE_MISS)
+    if cached is None or isinstance(cached, APIKey):
+        key_obj = cached
+    else:
+        async with AsyncSessionLocal() as session:
+            key_obj = await api_crud.get(session, key_hash)
+            # keeps the connection's prepared statements (see read_session)
+            await session.commit()
+        if key_obj is None:
+            api_key_cache.set(
+                key_hash, None, ttl=settings.API_KEY_CACHE_NEGATIVE_TTL_SECONDS
+            )
+        else:
+            cache_api_key(key_obj)
+
     if not key_obj:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, detail="Invalid API key"
         )
 
     if key_obj.expires_at and key_obj.expires_at < datetime.now():
+        api_key_cache.invalidate(key_hash)
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, detail="API key expired"
         )
 
+    await check_rate_limit(
+        request,
+        f"api_key:{key_obj.id}",
+        settings.RATE_LIMIT_API_KEY_PER_MINUTE
+        if key_obj.rate_limit is None
+        else key_obj.rate_limit,
+    )
+    api_key_usage.record(key_obj.id)
     return key_obj
@@ -0,0 +1,60 @@
+import csv
+import io
+from collections.abc import AsyncIterator
+from typing import Any, Literal
+
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.crud.base import CRUDOnlyRead
+from app.db.session import read_session
+
+ExportFormat = Literal["ndjson", "csv"]
+
+MEDIA_TYPES: dict[ExportFormat, str] = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+async def _export_rows(
+    crud: CRUDOnlyRead[Any], schema: type[BaseModel], fmt: ExportFormat
+) -> AsyncIterator[str]:
+    # The request's session is closed once the endpoint returns, so the
+    # stream reads through its own
+    async with read_session() as session:
+        if fmt == "csv":
+            fields = list(schema.model_fields)
+            buffer = io.StringIO()
+            writer = csv.DictWriter(buffer, fieldnames=fields)
+            writer.writeheader()
+            yield buffer.getvalue()
+        async for batch in crud.stream(session, batch_size=settings.EXPORT_BATCH_SIZE):
+            if fmt == "ndjson":
+                yield "".join(
+                    schema.model_validate(row).model_dump_json() + "\n" for row in batch
+                )
+                continue
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows(
+                schema.model_validate(row).model_dump(mode="json") for row in batch
+            )
+            yield buffer.getvalue()
+
+
+def export_response(
+    crud: CRUDOnlyRead[Any], schema: type[BaseModel], fmt: ExportFormat, name: str
+) -> StreamingResponse:
+    """
+    Stream every row as NDJSON or CSV, one chunk per batch.
+
+    Memory stays bounded by EXPORT_BATCH_SIZE: the next batch is only
+    fetched once the previous chunk has been sent to the client.
+    """
+    return StreamingResponse(
+        _export_rows(crud, schema, fmt),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{fmt}"'},
+    )
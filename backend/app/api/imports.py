@@ -0,0 +1,130 @@
+import codecs
+import csv
+import json
+from collections.abc import AsyncIterator
+from typing import Any, Literal
+
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from pydantic import BaseModel, ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.crud.base import CRUDCreateOnly
+from app.schemas.common import BatchItemError, ImportSummary
+
+ImportFormat = Literal["ndjson", "csv"]
+
+# Longest line buffered while looking for its end
+MAX_LINE_LENGTH = 1024 * 1024
+
+
+class _InvalidRecord:
+    def __init__(self, detail: str) -> None:
+        self.detail = detail
+
+
+async def _lines(body: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """
+    Split the body into lines, each with its line break: a "\r\n" may belong
+    to a quoted CSV field, so only the record parsers can drop it.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    pending = ""
+    async for chunk in body:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line + "\n"
+        if len(pending) > MAX_LINE_LENGTH:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Line exceeds {MAX_LINE_LENGTH} characters",
+            )
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+async def _ndjson_records(lines: AsyncIterator[str]) -> AsyncIterator[Any]:
+    async for line in lines:
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            yield _InvalidRecord("Invalid JSON")
+
+
+async def _csv_records(lines: AsyncIterator[str]) -> AsyncIterator[Any]:
+    header: list[str] | None = None
+    record = ""
+    async for line in lines:
+        record += line
+        # an odd number of quotes means a quoted field continues on the next line
+        if record.count('"') % 2:
+            continue
+        if not record.strip():
+            record = ""
+            continue
+        # the reader drops the record's line break, not those in quoted fields
+        fields = next(csv.reader([record]))
+        record = ""
+        if header is None:
+            header = fields
+        elif len(fields) != len(header):
+            yield _InvalidRecord(f"Expected {len(header)} fields, got {len(fields)}")
+        else:
+            # CSV can't tell an empty value from a missing one
+            yield {
+                name: value or None for name, value in zip(header, fields, strict=True)
+            }
+    if record:
+        yield _InvalidRecord("Unterminated quoted field")
+
+
+async def import_rows(
+    session: AsyncSession,
+    crud: CRUDCreateOnly[Any, Any],
+    schema: type[BaseModel],
+    fmt: ImportFormat,
+    body: AsyncIterator[bytes],
+) -> ImportSummary:
+    """
+    Validate a streamed NDJSON or CSV body against ``schema`` and load the
+    valid rows with one COPY in a single transaction, sending them
+    IMPORT_BATCH_SIZE rows at a time.
+
+    Only one batch is held in memory. Records are numbered from 0,
+    skipping blank lines and the CSV header; at most IMPORT_MAX_ERRORS
+    rejected records are detailed.
+    """
+    records = _csv_records if fmt == "csv" else _ndjson_records
+    summary = ImportSummary(accepted=0, rejected=0, errors=[])
+
+    def reject(index: int, detail: Any) -> None:
+        summary.rejected += 1
+        if len(summary.errors) < settings.IMPORT_MAX_ERRORS:
+            summary.errors.append(BatchItemError(index=index, detail=detail))
+
+    async def batches() -> AsyncIterator[list[BaseModel]]:
+        batch: list[BaseModel] = []
+        index = 0
+        async for raw in records(_lines(body)):
+            if isinstance(raw, _InvalidRecord):
+                reject(index, raw.detail)
+            else:
+                try:
+                    batch.append(schema.model_validate(raw))
+                except ValidationError as e:
+                    reject(index, jsonable_encoder(e.errors(include_url=False)))
+            index += 1
+            if len(batch) >= settings.IMPORT_BATCH_SIZE:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    summary.accepted = await crud.copy_many(session, batches())
+    await session.commit()
+    return summary
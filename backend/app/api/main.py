@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from app.api.routes import api_keys, items, login, private, users, utils
+from app.api.routes import api_keys, items, login, users, utils
 from app.core.config import settings
 
 api_router = APIRouter()
@@ -13,4 +13,6 @@ api_router.include_router(items.router)
 api_router.include_router(api_keys.router)
 
 if settings.ENVIRONMENT == "local":
+    from app.api.routes import private
+
     api_router.include_router(private.router)
@@ -0,0 +1,194 @@
+import logging
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.metrics import metrics, metrics_store
+from app.db.session import QueryStats, current_query_stats
+from app.schemas.utils import RouteQueryStatsPublic
+
+logger = logging.getLogger(__name__)
+
+requests_total = metrics.counter(
+    "http_requests_total", "HTTP requests by operation id, method and status"
+)
+request_duration = metrics.histogram(
+    "http_request_duration_seconds", "HTTP request latency by operation id"
+)
+requests_in_flight = metrics.gauge(
+    "http_requests_in_flight", "HTTP requests currently being served"
+)
+
+# Keep slowest statements readable in responses and logs
+MAX_STATEMENT_LENGTH = 500
+
+
+class RouteQueryStats:
+    def __init__(self) -> None:
+        self.requests = 0
+        self.queries = 0
+        self.max_queries = 0
+        self.db_seconds = 0.0
+        self.slowest_seconds = 0.0
+        self.slowest_statement: str | None = None
+        self.threshold_exceeded = 0
+
+    def add(self, stats: QueryStats) -> None:
+        self.requests += 1
+        self.queries += stats.count
+        self.max_queries = max(self.max_queries, stats.count)
+        self.db_seconds += stats.seconds
+        if stats.slowest_statement and stats.slowest_seconds >= self.slowest_seconds:
+            self.slowest_seconds = stats.slowest_seconds
+            self.slowest_statement = stats.slowest_statement[:MAX_STATEMENT_LENGTH]
+
+
+# "METHOD /path/template" -> aggregated stats of this worker
+route_query_stats: dict[str, RouteQueryStats] = {}
+
+
+def get_route_query_stats() -> dict[str, RouteQueryStatsPublic]:
+    return {
+        route: RouteQueryStatsPublic(
+            requests=stats.requests,
+            queries=stats.queries,
+            queries_per_request=stats.queries / stats.requests,
+            max_queries=stats.max_queries,
+            db_seconds=stats.db_seconds,
+            slowest_seconds=stats.slowest_seconds,
+            slowest_statement=stats.slowest_statement,
+            threshold_exceeded=stats.threshold_exceeded,
+        )
+        for route, stats in sorted(route_query_stats.items())
+    }
+
+
+def format_server_timing(stats: QueryStats, app_seconds: float) -> str:
+    return (
+        f'db;dur={stats.seconds * 1000:.2f};desc="{stats.count} queries", '
+        f"db-slowest;dur={stats.slowest_seconds * 1000:.2f}, "
+        f"app;dur={app_seconds * 1000:.2f}"
+    )
+
+
+class QueryStatsMiddleware:
+    """
+    Counts and times the SQL statements of each request, reports them in
+    the ``Server-Timing`` header and aggregates them per route.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = current_query_stats.set(stats)
+        started_at = time.perf_counter()
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                timing = format_server_timing(stats, time.perf_counter() - started_at)
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"server-timing", timing.encode("latin-1")),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_query_stats.reset(token)
+            self._record(scope, stats)
+
+    def _record(self, scope: Scope, stats: QueryStats) -> None:
+        route = scope.get("route")
+        if route is None:
+            return
+        key = f"{scope['method']} {route.path}"
+        route_stats = route_query_stats.setdefault(key, RouteQueryStats())
+        route_stats.add(stats)
+        threshold = settings.DB_QUERY_COUNT_WARNING_THRESHOLD
+        if threshold and stats.count > threshold:
+            route_stats.threshold_exceeded += 1
+            logger.warning(
+                "%s ran %d SQL statements (threshold %d), possible N+1 queries",
+                key,
+                stats.count,
+                threshold,
+            )
+
+
+class MetricsMiddleware:
+    """
+    Records request count and latency per route operation id (the
+    OpenAPI ``operationId``) and the number of requests in flight.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        requests_in_flight.inc()
+        started_at = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            requests_in_flight.dec()
+            # unique_id is only set on API routes, not on docs or 404s
+            operation_id = getattr(scope.get("route"), "unique_id", None)
+            if operation_id is not None:
+                request_duration.observe(
+                    time.perf_counter() - started_at, operation_id=operation_id
+                )
+                requests_total.inc(
+                    operation_id=operation_id,
+                    method=scope["method"],
+                    status=str(status_code),
+                )
+            metrics_store.maybe_sync()
+
+
+class RateLimitHeadersMiddleware:
+    """
+    Adds the ``X-RateLimit-*`` headers of the rate limit checked while
+    handling the request (see deps.check_rate_limit).
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # shared with request.state even when the scope is copied downstream
+        state = scope.setdefault("state", {})
+
+        async def send_with_headers(message: Message) -> None:
+            result = state.get("rate_limit")
+            if message["type"] == "http.response.start" and result is not None:
+                headers = MutableHeaders(scope=message)
+                for name, value in result.headers().items():
+                    headers.setdefault(name, value)
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
@@ -0,0 +1,36 @@
+from collections.abc import Sequence
+from typing import Any
+
+import pydantic_core
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response serialized by pydantic-core, which writes models, UUIDs
+    and datetimes straight to bytes instead of going through json.dumps.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return pydantic_core.to_json(content)
+
+
+def page_body(
+    adapter: TypeAdapter[list[Any]],
+    rows: Sequence[Any],
+    *,
+    count: int | None,
+    next_cursor: str | None,
+) -> bytes:
+    """
+    JSON body of a ``data``/``count``/``next_cursor`` page.
+
+    ``adapter`` validates all ORM rows in one call, and the result is
+    written as-is: endpoints return it in a Response, so FastAPI doesn't
+    validate it again against the response model.
+    """
+    data = adapter.validate_python(rows, from_attributes=True)
+    return pydantic_core.to_json(
+        {"data": data, "count": count, "next_cursor": next_cursor}
+    )
@@ -1,8 +1,11 @@
-from fastapi import APIRouter, Depends
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException
 
 from app.api.deps import SessionDep, get_current_active_superuser
 from app.crud.api_key import api_crud
-from app.schemas.api_key import APIKeyCreate, APIKeyPublic
+from app.schemas.api_key import APIKeyCreate, APIKeyCreated, APIKeyPublic
+from app.schemas.common import Message
 
 router = APIRouter(prefix="/api-keys", tags=["api-keys"])
 
@@ -10,8 +13,32 @@ router = APIRouter(prefix="/api-keys", tags=["api-keys"])
 @router.post(
     "/",
     dependencies=[Depends(get_current_active_superuser)],
-    response_model=APIKeyPublic,
+    response_model=APIKeyCreated,
+)
+async def create_api_key(
+    session: SessionDep, api_key_in: APIKeyCreate
+) -> APIKeyCreated:
+    """
+    Create an API key. The key itself is only returned here, it is stored
+    hashed.
+    """
+    api_key, key_plain = await api_crud.create_with_key(session, api_key_in)
+    return APIKeyCreated(
+        **APIKeyPublic.model_validate(api_key).model_dump(), key=key_plain
+    )
+
+
+@router.delete(
+    "/{id}",
+    dependencies=[Depends(get_current_active_superuser)],
+    response_model=Message,
 )
-async def create_api_key(session: SessionDep, api_key_in: APIKeyCreate) -> APIKeyPublic:
-    api_key = await api_crud.create(session, api_key_in)
-    return APIKeyPublic.model_validate(api_key)
+async def deactivate_api_key(session: SessionDep, id: uuid.UUID) -> Message:
+    """
+    Deactivate an API key. Other workers may accept it for up to
+    API_KEY_CACHE_TTL_SECONDS, unless API_KEY_CACHE_REDIS_URL is set.
+    """
+    api_key = await api_crud.deactivate(session, id)
+    if not api_key:
+        raise HTTPException(status_code=404, detail="API key not found")
+    return Message(message="API key deactivated successfully")
@@ -1,53 +1,175 @@
 import uuid
+from typing import Annotated, Any
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import func, select
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+)
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter, ValidationError
 
-from app.api.deps import SessionDep, get_api_key_record
+from app.api.deps import (
+    PageLimit,
+    PageSkip,
+    ReadSessionDep,
+    SessionDep,
+    get_api_key_record,
+)
+from app.api.export import ExportFormat, export_response
+from app.api.imports import ImportFormat, import_rows
+from app.api.responses import page_body
+from app.core.config import settings
+from app.core.response_cache import (
+    CachedResponse,
+    ResponseCache,
+    make_etag,
+    response_cache_backend,
+)
+from app.crud.base import InvalidCursorError
 from app.crud.item import item_crud
-from app.models.item import Item
-from app.schemas.common import Message
-from app.schemas.item import ItemCreate, ItemPublic, ItemsPublic, ItemUpdate
+from app.schemas.common import BatchItemError, ImportSummary, Message
+from app.schemas.item import (
+    ItemBatchUpdate,
+    ItemCreate,
+    ItemPublic,
+    ItemsBatchDelete,
+    ItemsBatchDeletePublic,
+    ItemsBatchPublic,
+    ItemsPublic,
+    ItemUpdate,
+)
 
 router = APIRouter(prefix="/items", tags=["items"])
 
+item_list_adapter = TypeAdapter(list[ItemPublic])
+
+# Invalidated by every item write
+item_cache = ResponseCache(
+    response_cache_backend, namespace="items", ttl=settings.RESPONSE_CACHE_TTL_SECONDS
+)
+
 
 @router.get(
     "/",
     dependencies=[Depends(get_api_key_record)],
     response_model=ItemsPublic,
+    responses={304: {"description": "Not modified"}},
 )
 async def read_items(
-    session: SessionDep,
-    skip: int = 0,
-    limit: int = 100,
-) -> ItemsPublic:
+    request: Request,
+    session: ReadSessionDep,
+    skip: PageSkip = 0,
+    limit: PageLimit = 100,
+    cursor: str | None = None,
+    include_count: bool = True,
+) -> Response:
     """
     Retrieve all items (paginated).
+
+    Pass the returned ``next_cursor`` as ``cursor`` to fetch the next page;
+    ``skip`` is kept for offset pagination.
     """
-    # Кол-во записей
-    count_result = await session.execute(select(func.count()).select_from(Item))
-    count: int = count_result.scalar_one()
 
-    # Сами записи
-    items = await item_crud.get_multi(session, skip=skip, limit=limit)
-    items_public = [ItemPublic.model_validate(item) for item in items]
-    return ItemsPublic(data=items_public, count=count)
+    async def build() -> CachedResponse:
+        # Кол-во записей
+        count = await item_crud.count(session) if include_count else None
+
+        # Сами записи
+        next_cursor = None
+        if skip:
+            items = await item_crud.get_multi(session, skip=skip, limit=limit)
+        else:
+            try:
+                items, next_cursor = await item_crud.get_page(
+                    session, limit=limit, cursor=cursor
+                )
+            except InvalidCursorError:
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+        return CachedResponse(
+            etag=make_etag(
+                count,
+                next_cursor,
+                [(item.id, item.date_updated) for item in items],
+            ),
+            body=page_body(
+                item_list_adapter, items, count=count, next_cursor=next_cursor
+            ),
+        )
+
+    return await item_cache.respond(request, build)
+
+
+@router.get(
+    "/search",
+    dependencies=[Depends(get_api_key_record)],
+    response_model=ItemsPublic,
+)
+async def search_items(
+    session: ReadSessionDep,
+    q: Annotated[str, Query(min_length=1, max_length=255)],
+    limit: PageLimit = 100,
+    cursor: str | None = None,
+) -> Response:
+    """
+    Search items by title and description, best matches first.
+
+    Supports web search syntax (``"exact phrase"``, ``or``, ``-exclude``),
+    title prefixes and typos in the title. Pass the returned
+    ``next_cursor`` as ``cursor`` to fetch the next page.
+    """
+    try:
+        items, next_cursor = await item_crud.search(
+            session, q, limit=limit, cursor=cursor
+        )
+    except InvalidCursorError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return Response(
+        page_body(item_list_adapter, items, count=None, next_cursor=next_cursor),
+        media_type="application/json",
+    )
+
+
+@router.get(
+    "/export",
+    dependencies=[Depends(get_api_key_record)],
+    response_class=StreamingResponse,
+)
+async def export_items(format: ExportFormat = "ndjson") -> StreamingResponse:
+    """
+    Stream all items as NDJSON (one JSON object per line) or CSV.
+    """
+    return export_response(item_crud, ItemPublic, format, "items")
 
 
 @router.get(
     "/{id}",
     dependencies=[Depends(get_api_key_record)],
     response_model=ItemPublic,
+    responses={304: {"description": "Not modified"}},
 )
-async def read_item(session: SessionDep, id: uuid.UUID) -> ItemPublic:
+async def read_item(
+    request: Request, session: ReadSessionDep, id: uuid.UUID
+) -> Response:
     """
     Get item by ID.
     """
-    item = await item_crud.get(session, id)
-    if not item:
-        raise HTTPException(status_code=404, detail="Item not found")
-    return ItemPublic.model_validate(item)
+
+    async def build() -> CachedResponse:
+        item = await item_crud.get(session, id)
+        if not item:
+            raise HTTPException(status_code=404, detail="Item not found")
+        return CachedResponse(
+            etag=make_etag(item.id, item.date_updated),
+            body=ItemPublic.model_validate(item).model_dump_json().encode(),
+        )
+
+    return await item_cache.respond(request, build)
 
 
 @router.post(
@@ -64,9 +186,156 @@ async def create_item(
     Create new item.
     """
     item = await item_crud.create(session, item_in)
+    await item_cache.invalidate()
     return ItemPublic.model_validate(item)
 
 
+def _check_batch_size(size: int) -> None:
+    if size > settings.BATCH_MAX_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch size exceeds {settings.BATCH_MAX_SIZE} entries",
+        )
+
+
+@router.post(
+    "/batch",
+    dependencies=[Depends(get_api_key_record)],
+    response_model=ItemsBatchPublic,
+)
+async def create_items_batch(
+    session: SessionDep,
+    items_in: Annotated[list[dict[str, Any]], Body()],
+) -> ItemsBatchPublic:
+    """
+    Create many items in one transaction; invalid entries are reported
+    by index and skipped.
+    """
+    _check_batch_size(len(items_in))
+    valid: list[ItemCreate] = []
+    errors: list[BatchItemError] = []
+    for index, raw in enumerate(items_in):
+        try:
+            valid.append(ItemCreate.model_validate(raw))
+        except ValidationError as e:
+            errors.append(
+                BatchItemError(
+                    index=index, detail=jsonable_encoder(e.errors(include_url=False))
+                )
+            )
+    items = await item_crud.create_many(session, valid)
+    await item_cache.invalidate()
+    return ItemsBatchPublic(
+        data=[ItemPublic.model_validate(item) for item in items], errors=errors
+    )
+
+
+@router.patch(
+    "/batch",
+    dependencies=[Depends(get_api_key_record)],
+    response_model=ItemsBatchPublic,
+)
+async def update_items_batch(
+    session: SessionDep,
+    items_in: Annotated[list[dict[str, Any]], Body()],
+) -> ItemsBatchPublic:
+    """
+    Update many items by ID in one transaction; invalid, duplicated or
+    missing entries are reported by index.
+    """
+    _check_batch_size(len(items_in))
+    updates: dict[uuid.UUID, ItemUpdate] = {}
+    positions: dict[uuid.UUID, int] = {}
+    errors: list[BatchItemError] = []
+    for index, raw in enumerate(items_in):
+        try:
+            item_in = ItemBatchUpdate.model_validate(raw)
+        except ValidationError as e:
+            errors.append(
+                BatchItemError(
+                    index=index, detail=jsonable_encoder(e.errors(include_url=False))
+                )
+            )
+            continue
+        if item_in.id in updates:
+            errors.append(BatchItemError(index=index, detail="Duplicate item id"))
+            continue
+        updates[item_in.id] = ItemUpdate.model_validate(
+            item_in.model_dump(exclude={"id"}, exclude_unset=True)
+        )
+        positions[item_in.id] = index
+
+    items = await item_crud.update_many(session, updates)
+    await item_cache.invalidate()
+    found = {item.id for item in items}
+    errors.extend(
+        BatchItemError(index=positions[id], detail="Item not found")
+        for id in updates
+        if id not in found
+    )
+    errors.sort(key=lambda error: error.index)
+    return ItemsBatchPublic(
+        data=[ItemPublic.model_validate(item) for item in items], errors=errors
+    )
+
+
+@router.post(
+    "/batch/delete",
+    dependencies=[Depends(get_api_key_record)],
+    response_model=ItemsBatchDeletePublic,
+)
+async def delete_items_batch(
+    session: SessionDep,
+    body: ItemsBatchDelete,
+) -> ItemsBatchDeletePublic:
+    """
+    Delete many items by ID in one transaction; missing IDs are reported
+    by index.
+    """
+    _check_batch_size(len(body.ids))
+    deleted = set(await item_crud.remove_many(session, body.ids))
+    await item_cache.invalidate()
+    errors = [
+        BatchItemError(index=index, detail="Item not found")
+        for index, id in enumerate(body.ids)
+        if id not in deleted
+    ]
+    return ItemsBatchDeletePublic(
+        deleted=[id for id in dict.fromkeys(body.ids) if id in deleted],
+        errors=errors,
+    )
+
+
+@router.post(
+    "/import",
+    dependencies=[Depends(get_api_key_record)],
+    response_model=ImportSummary,
+    openapi_extra={
+        "requestBody": {
+            "content": {
+                "application/x-ndjson": {"schema": {"type": "string"}},
+                "text/csv": {"schema": {"type": "string"}},
+            },
+            "required": True,
+        }
+    },
+)
+async def import_items(
+    request: Request,
+    session: SessionDep,
+    format: ImportFormat = "ndjson",
+) -> ImportSummary:
+    """
+    Load items from an NDJSON or CSV body (with a title,description header)
+    in one transaction; invalid rows are counted and skipped.
+    """
+    summary = await import_rows(
+        session, item_crud, ItemCreate, format, request.stream()
+    )
+    await item_cache.invalidate()
+    return summary
+
+
 @router.put(
     "/{id}",
     dependencies=[Depends(get_api_key_record)],
@@ -80,10 +349,10 @@ async def update_item(
     """
     Update item by ID.
     """
-    item = await item_crud.get(session, id)
+    item = await item_crud.update_by_id(session, id, item_in)
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
-    item = await item_crud.update(session, db_obj=item, obj_in=item_in)
+    await item_cache.invalidate()
     return ItemPublic.model_validate(item)
 
 
@@ -99,8 +368,8 @@ async def delete_item(
     """
     Delete item by ID.
     """
-    item = await item_crud.get(session, id)
+    item = await item_crud.remove(session, id)
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
-    await item_crud.remove(session, id)
+    await item_cache.invalidate()
     return Message(message="Item deleted successfully")
@@ -29,9 +29,16 @@ async def login_access_token(
     elif not user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    claims = None
+    if settings.JWT_STATELESS_AUTH:
+        claims = {
+            "is_active": user.is_active,
+            "is_superuser": user.is_superuser,
+            "ver": user.token_version,
+        }
     return Token(
         access_token=security.create_access_token(
-            user.id, expires_delta=access_token_expires
+            user.id, expires_delta=access_token_expires, claims=claims
         )
     )
 
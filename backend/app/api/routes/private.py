@@ -4,7 +4,8 @@ from fastapi import APIRouter
 from pydantic import BaseModel
 
 from app.api.deps import SessionDep
-from app.core.security import get_password_hash
+from app.core.security import password_hasher
+from app.crud.user import user_crud
 from app.models.user import User
 from app.schemas.user import UserPublic
 
@@ -27,10 +28,11 @@ async def create_user(user_in: PrivateUserCreate, session: SessionDep) -> Any:
     user = User(
         email=user_in.email,
         full_name=user_in.full_name,
-        hashed_password=get_password_hash(user_in.password),
+        hashed_password=await password_hasher.hash(user_in.password),
     )
 
     session.add(user)
     await session.commit()
+    user_crud.invalidate_count()
 
     return user
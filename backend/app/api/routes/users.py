@@ -1,17 +1,29 @@
 import uuid
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy import func, select
-
-from app.api.deps import CurrentUser, SessionDep, get_current_active_superuser
-from app.core.security import get_password_hash, verify_password
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
+
+from app.api.deps import (
+    CurrentPrincipal,
+    CurrentUser,
+    PageLimit,
+    PageSkip,
+    ReadSessionDep,
+    SessionDep,
+    get_current_active_superuser,
+)
+from app.api.export import ExportFormat, export_response
+from app.api.responses import page_body
+from app.core.security import password_hasher
+from app.crud.base import InvalidCursorError
 from app.crud.user import user_crud
-from app.models.user import User
 from app.schemas.common import Message
 from app.schemas.user import (
     UpdatePassword,
     UserCreate,
     UserPublic,
+    UserRecord,
     UserRegister,
     UsersPublic,
     UserUpdate,
@@ -20,6 +32,9 @@ from app.schemas.user import (
 
 router = APIRouter(prefix="/users", tags=["users"])
 
+# Serializes like UserPublic without revalidating stored emails
+user_list_adapter = TypeAdapter(list[UserRecord])
+
 
 @router.get(
     "/",
@@ -27,17 +42,29 @@ router = APIRouter(prefix="/users", tags=["users"])
     response_model=UsersPublic,
 )
 async def read_users(
-    session: SessionDep,
-    skip: int = 0,
-    limit: int = 100,
-) -> UsersPublic:
+    session: ReadSessionDep,
+    skip: PageSkip = 0,
+    limit: PageLimit = 100,
+    cursor: str | None = None,
+    include_count: bool = True,
+) -> Response:
     """Return paginated list of users (superuser-only)."""
-    count_result = await session.execute(select(func.count()).select_from(User))
-    count: int = count_result.scalar_one()
-
-    users = await user_crud.get_multi(session, skip=skip, limit=limit)
-    users_public = [UserPublic.model_validate(user) for user in users]
-    return UsersPublic(data=users_public, count=count)
+    count = await user_crud.count(session) if include_count else None
+
+    next_cursor = None
+    if skip:
+        users = await user_crud.get_multi(session, skip=skip, limit=limit)
+    else:
+        try:
+            users, next_cursor = await user_crud.get_page(
+                session, limit=limit, cursor=cursor
+            )
+        except InvalidCursorError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    return Response(
+        page_body(user_list_adapter, users, count=count, next_cursor=next_cursor),
+        media_type="application/json",
+    )
 
 
 @router.post(
@@ -100,14 +127,16 @@ async def update_password_me(
     current_user: CurrentUser,
     body: UpdatePassword,
 ) -> Message:
-    if not verify_password(body.current_password, current_user.hashed_password):
+    if not await password_hasher.verify(
+        body.current_password, current_user.hashed_password
+    ):
         raise HTTPException(status_code=400, detail="Incorrect current password")
     if body.current_password == body.new_password:
         raise HTTPException(status_code=400, detail="New password must differ")
 
-    current_user.hashed_password = get_password_hash(body.new_password)
-    session.add(current_user)
-    await session.commit()
+    await user_crud.update(
+        session, current_user, UserUpdate(password=body.new_password)
+    )
 
     return Message(message="Password updated successfully")
 
@@ -119,16 +148,27 @@ async def delete_user_me(session: SessionDep, current_user: CurrentUser) -> Mess
             status_code=403, detail="Superusers cannot delete themselves"
         )
 
-    await session.delete(current_user)
-    await session.commit()
+    await user_crud.remove(session, current_user.id)
     return Message(message="User deleted successfully")
 
 
+@router.get(
+    "/export",
+    dependencies=[Depends(get_current_active_superuser)],
+    response_class=StreamingResponse,
+)
+async def export_users(format: ExportFormat = "ndjson") -> StreamingResponse:
+    """
+    Stream all users as NDJSON or CSV (superuser-only).
+    """
+    return export_response(user_crud, UserPublic, format, "users")
+
+
 @router.get("/{user_id}", response_model=UserPublic)
 async def read_user_by_id(
     user_id: uuid.UUID,
-    session: SessionDep,
-    current_user: CurrentUser,
+    session: ReadSessionDep,
+    current_user: CurrentPrincipal,
 ) -> UserPublic:
     if not current_user.is_superuser:
         raise HTTPException(status_code=403, detail="Insufficient privileges")
@@ -169,7 +209,7 @@ async def update_user(
 )
 async def delete_user(
     session: SessionDep,
-    current_user: CurrentUser,
+    current_user: CurrentPrincipal,
     user_id: uuid.UUID,
 ) -> Message:
     user = await user_crud.get(session, user_id)
@@ -178,6 +218,5 @@ async def delete_user(
     if user.id == current_user.id:
         raise HTTPException(status_code=403, detail="You can't delete yourself")
 
-    await session.delete(user)
-    await session.commit()
+    await user_crud.remove(session, user.id)
     return Message(message="User deleted successfully")
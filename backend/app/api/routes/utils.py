@@ -1,4 +1,21 @@
-from fastapi import APIRouter
+import time
+
+from fastapi import APIRouter, Depends, Response
+from fastapi.responses import PlainTextResponse
+
+from app.api.deps import get_current_active_superuser
+from app.api.middleware import get_route_query_stats
+from app.core.config import settings
+from app.core.metrics import metrics_store
+from app.db.health import database_probe
+from app.db.session import InstrumentedAsyncPool, engine, get_pool_stats
+from app.schemas.utils import (
+    DatabaseHealthPublic,
+    PoolHealthPublic,
+    PoolStatsPublic,
+    ReadinessPublic,
+    RouteQueryStatsPublic,
+)
 
 router = APIRouter(prefix="/utils", tags=["utils"])
 
@@ -6,3 +23,75 @@ router = APIRouter(prefix="/utils", tags=["utils"])
 @router.get("/health-check/")
 async def health_check() -> bool:
     return True
+
+
+@router.get("/liveness/")
+async def liveness() -> bool:
+    """
+    The worker is up and serving requests; checks no dependency.
+    """
+    return True
+
+
+@router.get(
+    "/readiness/",
+    response_model=ReadinessPublic,
+    responses={503: {"model": ReadinessPublic, "description": "Not ready"}},
+)
+async def readiness(response: Response) -> ReadinessPublic:
+    """
+    Whether the worker can serve requests that need the database: 503 when
+    the database doesn't answer or the connection pool is exhausted.
+    """
+    probe = await database_probe.check()
+    pool = engine.pool
+    assert isinstance(pool, InstrumentedAsyncPool)
+    capacity = pool.size() + settings.DB_MAX_OVERFLOW
+    saturation = pool.checkedout() / capacity if capacity else 0.0
+    ready = probe.ok and saturation < settings.HEALTH_CHECK_MAX_POOL_SATURATION
+    if not ready:
+        response.status_code = 503
+    return ReadinessPublic(
+        ready=ready,
+        database=DatabaseHealthPublic(
+            ok=probe.ok,
+            latency_ms=probe.latency_seconds * 1000,
+            checked_seconds_ago=time.monotonic() - probe.checked_at,
+            error=probe.error,
+        ),
+        pool=PoolHealthPublic(checked_out=pool.checkedout(), saturation=saturation),
+    )
+
+
+@router.get(
+    "/pool-stats/",
+    dependencies=[Depends(get_current_active_superuser)],
+    response_model=PoolStatsPublic,
+)
+async def pool_stats() -> PoolStatsPublic:
+    """
+    Connection pool statistics of the worker serving the request.
+    """
+    return get_pool_stats()
+
+
+@router.get(
+    "/query-stats/",
+    dependencies=[Depends(get_current_active_superuser)],
+    response_model=dict[str, RouteQueryStatsPublic],
+)
+async def query_stats() -> dict[str, RouteQueryStatsPublic]:
+    """
+    SQL statements per route, aggregated by the worker serving the request.
+    """
+    return get_route_query_stats()
+
+
+@router.get("/metrics/", response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    """
+    Metrics of all workers in the Prometheus text exposition format.
+    """
+    return PlainTextResponse(
+        metrics_store.collect(), media_type="text/plain; version=0.0.4"
+    )
@@ -1,36 +1,36 @@
 import asyncio
 import logging
 
-from sqlalchemy import select
-from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+from sqlalchemy.ext.asyncio import AsyncEngine
 from tenacity import (
     after_log,
     before_log,
     retry,
-    stop_after_attempt,
-    wait_fixed,
+    stop_after_delay,
+    wait_random_exponential,
 )
 
+from app.db.health import ping
 from app.db.session import engine
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-max_tries = 60 * 5  # 5 minutes
-wait_seconds = 1
+max_wait_seconds = 60 * 5  # 5 minutes
+# Exponential backoff with jitter: retries after ~0.1s, 0.2s, 0.4s... up to
+# 5s, so a database that comes up quickly is noticed quickly
+min_retry_seconds = 0.1
+max_retry_seconds = 5
 
 
 @retry(
-    stop=stop_after_attempt(max_tries),
-    wait=wait_fixed(wait_seconds),
+    stop=stop_after_delay(max_wait_seconds),
+    wait=wait_random_exponential(multiplier=min_retry_seconds, max=max_retry_seconds),
     before=before_log(logger, logging.INFO),
     after=after_log(logger, logging.WARN),
 )
 async def init(db_engine: AsyncEngine) -> None:
-    async_session = async_sessionmaker(bind=db_engine, expire_on_commit=False)
-
-    async with async_session() as session:
-        await session.execute(select(1))
+    await ping(db_engine)
 
 
 async def main() -> None:
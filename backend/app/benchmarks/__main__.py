@@ -0,0 +1,157 @@
+"""
+Throughput and latency benchmarks for the key API flows.
+
+Runs the ASGI app in-process (default) or against a running server
+(``--base-url http://localhost:8000``) and writes the results as JSON so
+runs can be compared between commits::
+
+    python -m app.benchmarks --output before.json
+    python -m app.benchmarks --output after.json --compare before.json
+
+The app needs its PostgreSQL database with migrations and initial data
+applied (see scripts/prestart.sh); SQLite can't stand in because the app
+relies on PostgreSQL-specific SQL. Rate limits are turned off in-process;
+start a server under test with RATE_LIMIT_ENABLED=false.
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import subprocess
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from app.benchmarks.runner import ScenarioResult, run_scenario
+from app.benchmarks.scenarios import build_scenarios, setup, teardown
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m app.benchmarks")
+    parser.add_argument(
+        "--base-url", help="benchmark a running server instead of in-process"
+    )
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        dest="scenarios",
+        help="only run these scenarios (repeatable)",
+    )
+    parser.add_argument("--output", type=Path, default=Path("benchmark-results.json"))
+    parser.add_argument("--compare", type=Path, help="previous results to diff against")
+    return parser.parse_args(argv)
+
+
+@asynccontextmanager
+async def open_client(base_url: str | None) -> AsyncIterator[httpx.AsyncClient]:
+    if base_url:
+        async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+            yield client
+        return
+
+    from app.core.config import settings
+    from app.main import app
+
+    settings.RATE_LIMIT_ENABLED = False
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://benchmark", timeout=60
+        ) as client:
+            yield client
+
+
+def git_commit() -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip()
+
+
+def print_results(results: list[ScenarioResult], baseline: dict[str, Any]) -> None:
+    header = f"{'scenario':<14}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'queries':>9}{'errors':>8}"
+    print(header)
+    print("-" * len(header))
+    for result in results:
+        queries = (
+            f"{result.queries_per_request:.1f}"
+            if result.queries_per_request is not None
+            else "-"
+        )
+        print(
+            f"{result.name:<14}{result.requests_per_second:>10.1f}"
+            f"{result.latency_ms['p50']:>10.2f}{result.latency_ms['p95']:>10.2f}"
+            f"{result.latency_ms['p99']:>10.2f}{queries:>9}{result.errors:>8}"
+        )
+        previous = baseline.get(result.name)
+        if previous:
+            rps_delta = _delta(
+                previous["requests_per_second"], result.requests_per_second
+            )
+            p95_delta = _delta(previous["latency_ms"]["p95"], result.latency_ms["p95"])
+            print(f"{'':<14}{rps_delta:>10}{'':>10}{p95_delta:>10}")
+
+
+def _delta(before: float, after: float) -> str:
+    if not before:
+        return "n/a"
+    return f"{(after - before) / before * 100:+.1f}%"
+
+
+async def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    baseline: dict[str, Any] = {}
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())["results"]
+
+    results: list[ScenarioResult] = []
+    async with open_client(args.base_url) as client:
+        ctx = await setup(client)
+        try:
+            for scenario in build_scenarios(ctx, args.requests):
+                if args.scenarios and scenario.name not in args.scenarios:
+                    continue
+                results.append(
+                    await run_scenario(
+                        client,
+                        scenario,
+                        requests=args.requests,
+                        concurrency=args.concurrency,
+                        count_queries=args.base_url is None,
+                    )
+                )
+        finally:
+            await teardown(client, ctx)
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "mode": "server" if args.base_url else "in-process",
+            "base_url": args.base_url,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "python": platform.python_version(),
+        },
+        "results": {result.name: result.to_dict() for result in results},
+    }
+    args.output.write_text(json.dumps(report, indent=2))
+    print_results(results, baseline)
+    print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,134 @@
+import asyncio
+import math
+import statistics
+import time
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+import httpx
+from sqlalchemy import event
+
+from app.db.session import engine, replica_router
+
+# One benchmarked request: receives the iteration number, returns the response
+RequestFn = Callable[[httpx.AsyncClient, int], Awaitable[httpx.Response]]
+# Untimed preparation before a scenario runs: receives its request count
+PrepareFn = Callable[[httpx.AsyncClient, int], Awaitable[None]]
+
+
+@dataclass
+class Scenario:
+    name: str
+    request: RequestFn
+    # Requests per run; defaults to the runner-wide value
+    requests: int | None = None
+    prepare: PrepareFn | None = None
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    requests: int
+    errors: int
+    duration_seconds: float
+    requests_per_second: float
+    latency_ms: dict[str, float]
+    # None when the app runs out of process and queries can't be observed
+    queries_per_request: float | None = None
+    status_codes: dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile, ``pct`` in 0..100."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class QueryCounter:
+    """Counts SQL statements executed by the in-process app engines."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self._engines = [engine, *replica_router.engines]
+
+    def _on_execute(self, *_args: Any) -> None:
+        self.count += 1
+
+    def __enter__(self) -> "QueryCounter":
+        for db_engine in self._engines:
+            event.listen(
+                db_engine.sync_engine, "before_cursor_execute", self._on_execute
+            )
+        return self
+
+    def __exit__(self, *_exc: Any) -> None:
+        for db_engine in self._engines:
+            event.remove(
+                db_engine.sync_engine, "before_cursor_execute", self._on_execute
+            )
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    *,
+    requests: int,
+    concurrency: int,
+    count_queries: bool,
+) -> ScenarioResult:
+    total = scenario.requests or requests
+    if scenario.prepare is not None:
+        await scenario.prepare(client, total)
+    latencies: list[float] = []
+    status_codes: dict[str, int] = {}
+    errors = 0
+    next_iteration = iter(range(total))
+
+    async def worker() -> None:
+        nonlocal errors
+        for iteration in next_iteration:
+            start = time.perf_counter()
+            try:
+                response = await scenario.request(client, iteration)
+            except httpx.HTTPError:
+                errors += 1
+                continue
+            latencies.append(time.perf_counter() - start)
+            code = str(response.status_code)
+            status_codes[code] = status_codes.get(code, 0) + 1
+            if response.is_error:
+                errors += 1
+
+    counter = QueryCounter()
+    start = time.perf_counter()
+    if count_queries:
+        with counter:
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+    else:
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    duration = time.perf_counter() - start
+
+    latencies_ms = [latency * 1000 for latency in latencies]
+    return ScenarioResult(
+        name=scenario.name,
+        requests=total,
+        errors=errors,
+        duration_seconds=duration,
+        requests_per_second=total / duration if duration else 0.0,
+        latency_ms={
+            "mean": statistics.fmean(latencies_ms) if latencies_ms else 0.0,
+            "p50": percentile(latencies_ms, 50),
+            "p95": percentile(latencies_ms, 95),
+            "p99": percentile(latencies_ms, 99),
+            "max": max(latencies_ms, default=0.0),
+        },
+        queries_per_request=counter.count / total if count_queries else None,
+        status_codes=status_codes,
+    )
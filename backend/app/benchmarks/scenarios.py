@@ -0,0 +1,145 @@
+from dataclasses import dataclass, field
+
+import httpx
+
+from app.benchmarks.runner import Scenario
+from app.core.config import settings
+
+API = settings.API_V1_STR
+
+
+@dataclass
+class BenchmarkContext:
+    auth_headers: dict[str, str]
+    api_key_headers: dict[str, str]
+    api_key_id: str
+    item_ids: list[str] = field(default_factory=list)
+    list_cursor: str | None = None
+
+
+async def setup(client: httpx.AsyncClient) -> BenchmarkContext:
+    r = await client.post(
+        f"{API}/login/access-token",
+        data={
+            "username": settings.FIRST_SUPERUSER,
+            "password": settings.FIRST_SUPERUSER_PASSWORD,
+        },
+    )
+    r.raise_for_status()
+    auth_headers = {"Authorization": f"Bearer {r.json()['access_token']}"}
+    r = await client.post(
+        f"{API}/api-keys/",
+        headers=auth_headers,
+        json={"name": "benchmark", "rate_limit": 0},
+    )
+    r.raise_for_status()
+    api_key = r.json()
+    return BenchmarkContext(
+        auth_headers=auth_headers,
+        api_key_headers={"X-API-Key": api_key["key"]},
+        api_key_id=api_key["id"],
+    )
+
+
+async def teardown(client: httpx.AsyncClient, ctx: BenchmarkContext) -> None:
+    for start in range(0, len(ctx.item_ids), settings.BATCH_MAX_SIZE):
+        await client.post(
+            f"{API}/items/batch/delete",
+            headers=ctx.api_key_headers,
+            json={"ids": ctx.item_ids[start : start + settings.BATCH_MAX_SIZE]},
+        )
+    await client.delete(f"{API}/api-keys/{ctx.api_key_id}", headers=ctx.auth_headers)
+
+
+async def ensure_items(
+    client: httpx.AsyncClient, ctx: BenchmarkContext, count: int
+) -> None:
+    """Create items until ``ctx.item_ids`` holds at least ``count``."""
+    while len(ctx.item_ids) < count:
+        size = min(count - len(ctx.item_ids), settings.BATCH_MAX_SIZE)
+        r = await client.post(
+            f"{API}/items/batch",
+            headers=ctx.api_key_headers,
+            json=[
+                {"title": f"benchmark seed {i}", "description": "benchmark item"}
+                for i in range(size)
+            ],
+        )
+        r.raise_for_status()
+        ctx.item_ids.extend(item["id"] for item in r.json()["data"])
+
+
+def build_scenarios(ctx: BenchmarkContext, requests: int) -> list[Scenario]:
+    """
+    Key API flows. Scenarios that need items create them first when an
+    earlier scenario (item_create) didn't run.
+    """
+
+    async def seed_items(client: httpx.AsyncClient, _: int) -> None:
+        await ensure_items(client, ctx, 1)
+
+    async def seed_items_to_delete(client: httpx.AsyncClient, total: int) -> None:
+        # each request deletes one
+        await ensure_items(client, ctx, total)
+
+    async def login(client: httpx.AsyncClient, _: int) -> httpx.Response:
+        return await client.post(
+            f"{API}/login/access-token",
+            data={
+                "username": settings.FIRST_SUPERUSER,
+                "password": settings.FIRST_SUPERUSER_PASSWORD,
+            },
+        )
+
+    async def users_me(client: httpx.AsyncClient, _: int) -> httpx.Response:
+        return await client.get(f"{API}/users/me", headers=ctx.auth_headers)
+
+    async def item_create(client: httpx.AsyncClient, i: int) -> httpx.Response:
+        r = await client.post(
+            f"{API}/items/",
+            headers=ctx.api_key_headers,
+            json={"title": f"benchmark {i}", "description": "benchmark item"},
+        )
+        if r.status_code == 201:
+            ctx.item_ids.append(r.json()["id"])
+        return r
+
+    async def item_read(client: httpx.AsyncClient, i: int) -> httpx.Response:
+        item_id = ctx.item_ids[i % len(ctx.item_ids)]
+        return await client.get(f"{API}/items/{item_id}", headers=ctx.api_key_headers)
+
+    async def item_update(client: httpx.AsyncClient, i: int) -> httpx.Response:
+        item_id = ctx.item_ids[i % len(ctx.item_ids)]
+        return await client.put(
+            f"{API}/items/{item_id}",
+            headers=ctx.api_key_headers,
+            json={"title": f"benchmark {i} updated"},
+        )
+
+    async def items_list(client: httpx.AsyncClient, _: int) -> httpx.Response:
+        params: dict[str, str | int] = {"limit": 50}
+        if ctx.list_cursor:
+            params["cursor"] = ctx.list_cursor
+        r = await client.get(
+            f"{API}/items/", headers=ctx.api_key_headers, params=params
+        )
+        if r.status_code == 200:
+            ctx.list_cursor = r.json()["next_cursor"]
+        return r
+
+    async def item_delete(client: httpx.AsyncClient, _: int) -> httpx.Response:
+        item_id = ctx.item_ids.pop()
+        return await client.delete(
+            f"{API}/items/{item_id}", headers=ctx.api_key_headers
+        )
+
+    return [
+        # bcrypt-bound, so fewer iterations
+        Scenario("login", login, requests=max(1, requests // 10)),
+        Scenario("users_me", users_me),
+        Scenario("item_create", item_create),
+        Scenario("item_read", item_read, prepare=seed_items),
+        Scenario("item_update", item_update, prepare=seed_items),
+        Scenario("items_list", items_list),
+        Scenario("item_delete", item_delete, prepare=seed_items_to_delete),
+    ]
@@ -0,0 +1,149 @@
+"""
+Microbenchmark of the list endpoints' JSON serialization, without the
+database or HTTP stack::
+
+    python -m app.benchmarks.serialization --rows 100
+
+Compares, for pages of in-memory ORM rows:
+
+- ``response_model``: per-row ``model_validate``, then FastAPI validating
+  and serializing the page against the response model, rendered by
+  Starlette's JSONResponse (json.dumps);
+- ``fast_response``: the same with FastJSONResponse;
+- ``page_body``: the list endpoints' TypeAdapter, one pass written
+  straight to bytes.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import uuid
+from collections.abc import Awaitable, Callable, Sequence
+from datetime import datetime
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, serialize_response
+from pydantic import BaseModel, TypeAdapter
+
+from app.api.responses import FastJSONResponse, page_body
+from app.api.routes.items import item_list_adapter
+from app.api.routes.users import user_list_adapter
+from app.models.item import Item
+from app.models.user import User
+from app.schemas.item import ItemPublic, ItemsPublic
+from app.schemas.user import UserPublic, UsersPublic
+
+# Serializes one page of rows to the response body
+Serializer = Callable[[Sequence[Any]], Awaitable[bytes]]
+
+
+def make_items(rows: int) -> list[Item]:
+    now = datetime.now()
+    return [
+        Item(
+            id=uuid.uuid4(),
+            title=f"Item {i}",
+            description="Lorem ipsum dolor sit amet " * 4,
+            date_created=now,
+            date_updated=now,
+        )
+        for i in range(rows)
+    ]
+
+
+def make_users(rows: int) -> list[User]:
+    return [
+        User(
+            id=uuid.uuid4(),
+            email=f"user{i}@example.com",
+            full_name=f"User {i}",
+            hashed_password="x" * 60,
+            is_active=True,
+            is_superuser=False,
+        )
+        for i in range(rows)
+    ]
+
+
+def response_model_path(
+    schema: type[BaseModel],
+    page: type[BaseModel],
+    response_class: type[JSONResponse],
+) -> Serializer:
+    route = APIRoute("/", endpoint=lambda: None, response_model=page)
+
+    async def serialize(rows: Sequence[Any]) -> bytes:
+        body = page(
+            data=[schema.model_validate(row) for row in rows],
+            count=len(rows),
+            next_cursor=None,
+        )
+        content = await serialize_response(
+            field=route.secure_cloned_response_field, response_content=body
+        )
+        return bytes(response_class(content).body)
+
+    return serialize
+
+
+def page_body_path(adapter: TypeAdapter[list[Any]]) -> Serializer:
+    async def serialize(rows: Sequence[Any]) -> bytes:
+        return page_body(adapter, rows, count=len(rows), next_cursor=None)
+
+    return serialize
+
+
+def build_paths(
+    schema: type[BaseModel], page: type[BaseModel], adapter: TypeAdapter[list[Any]]
+) -> dict[str, Serializer]:
+    return {
+        "response_model": response_model_path(schema, page, JSONResponse),
+        "fast_response": response_model_path(schema, page, FastJSONResponse),
+        "page_body": page_body_path(adapter),
+    }
+
+
+async def time_path(
+    serialize: Serializer, rows: Sequence[Any], iterations: int, rounds: int = 5
+) -> float:
+    """Seconds per call, best of ``rounds`` to filter out machine noise."""
+    await serialize(rows)
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            await serialize(rows)
+        best = min(best, (time.perf_counter() - start) / iterations)
+    return best
+
+
+async def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.benchmarks.serialization")
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args(argv)
+
+    datasets: dict[str, tuple[list[Any], type[BaseModel], type[BaseModel], Any]] = {
+        "items": (make_items(args.rows), ItemPublic, ItemsPublic, item_list_adapter),
+        "users": (make_users(args.rows), UserPublic, UsersPublic, user_list_adapter),
+    }
+    print(f"{'endpoint':<10}{'path':<16}{'us/page':>10}{'speedup':>9}")
+    for name, (rows, schema, page, adapter) in datasets.items():
+        paths = build_paths(schema, page, adapter)
+        bodies = {
+            path: json.loads(await serialize(rows)) for path, serialize in paths.items()
+        }
+        assert all(body == bodies["response_model"] for body in bodies.values())
+        baseline = None
+        for path, serialize in paths.items():
+            seconds = await time_path(serialize, rows, args.iterations)
+            baseline = baseline or seconds
+            print(
+                f"{name:<10}{path:<16}{seconds * 1e6:>10.1f}{baseline / seconds:>8.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,188 @@
+"""
+Worker cold-start profile: per-module import time and time to the first
+response, measured in fresh interpreters::
+
+    python -m app.benchmarks.startup --runs 5
+
+Each run starts ``python -X importtime``, imports ``app.main``, runs the
+lifespan startup and serves one request through the ASGI interface, like
+a worker booting. Phases are reported as the median over the runs, and
+imports from the last run: the slowest packages by their own import time
+(summed over their modules) and the slowest ``app`` modules including what
+they import.
+
+Lifespan startup needs the database (see ``python -m app.benchmarks``);
+``--no-lifespan`` profiles the imports and the first response only.
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass
+class ImportTime:
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+def positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+    return number
+
+
+def parse_importtime(stderr: str) -> list[ImportTime]:
+    """Parse the ``-X importtime`` report, skipping unrelated lines."""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, module = line.removeprefix("import time:").split("|")
+        entries.append(ImportTime(module.strip(), int(self_us), int(cumulative_us)))
+    return entries
+
+
+def by_package(entries: list[ImportTime]) -> dict[str, int]:
+    """Own import time summed per top-level package, in microseconds."""
+    totals: dict[str, int] = defaultdict(int)
+    for entry in entries:
+        totals[entry.module.partition(".")[0]] += entry.self_us
+    return dict(sorted(totals.items(), key=lambda item: -item[1]))
+
+
+async def _first_response(app: Any, path: str) -> int:
+    status = 0
+
+    async def receive() -> dict[str, Any]:
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message: dict[str, Any]) -> None:
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [(b"host", b"startup")],
+        "server": ("startup", 80),
+        "client": ("127.0.0.1", 0),
+    }
+    await app(scope, receive, send)
+    return status
+
+
+async def _boot(path: str, lifespan: bool) -> dict[str, Any]:
+    """Runs in the child interpreter; returns wall-clock timestamps."""
+    started = time.time()
+    from app.main import app
+
+    imported = time.time()
+    if lifespan:
+        async with app.router.lifespan_context(app):
+            ready = time.time()
+            status = await _first_response(app, path)
+            responded = time.time()
+    else:
+        ready = time.time()
+        status = await _first_response(app, path)
+        responded = time.time()
+    return {
+        "started": started,
+        "imported": imported,
+        "ready": ready,
+        "responded": responded,
+        "status": status,
+    }
+
+
+def run_once(path: str, lifespan: bool) -> tuple[dict[str, float], str]:
+    """Boot one fresh interpreter; returns phase durations in ms and its
+    importtime report."""
+    args = [
+        sys.executable,
+        "-X",
+        "importtime",
+        "-m",
+        "app.benchmarks.startup",
+        "--child",
+        "--path",
+        path,
+    ]
+    if not lifespan:
+        args.append("--no-lifespan")
+    spawned = time.time()
+    result = subprocess.run(args, capture_output=True, text=True, check=True)
+    stamps = json.loads(result.stdout.strip().splitlines()[-1])
+    if stamps["status"] >= 500:
+        raise RuntimeError(f"GET {path} answered {stamps['status']}")
+    phases = {
+        "interpreter": stamps["started"] - spawned,
+        "import": stamps["imported"] - stamps["started"],
+        "lifespan": stamps["ready"] - stamps["imported"],
+        "first_response": stamps["responded"] - stamps["ready"],
+        "total": stamps["responded"] - spawned,
+    }
+    return {name: seconds * 1000 for name, seconds in phases.items()}, result.stderr
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.benchmarks.startup")
+    parser.add_argument("--runs", type=positive_int, default=5)
+    parser.add_argument("--top", type=positive_int, default=15)
+    parser.add_argument("--path", default="/api/v1/utils/health-check/")
+    parser.add_argument("--no-lifespan", dest="lifespan", action="store_false")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        print(json.dumps(asyncio.run(_boot(args.path, args.lifespan))))
+        return
+
+    runs = []
+    stderr = ""
+    for _ in range(args.runs):
+        phases, stderr = run_once(args.path, args.lifespan)
+        runs.append(phases)
+
+    print(f"{'phase':<16}{'median ms':>10}{'min ms':>10}")
+    for name in runs[0]:
+        values = [run[name] for run in runs]
+        print(f"{name:<16}{statistics.median(values):>10.1f}{min(values):>10.1f}")
+
+    entries = parse_importtime(stderr)
+    print(f"\n{'package':<32}{'self ms':>10}")
+    for package, self_us in list(by_package(entries).items())[: args.top]:
+        print(f"{package:<32}{self_us / 1000:>10.1f}")
+
+    app_modules = sorted(
+        (entry for entry in entries if entry.module.startswith("app.")),
+        key=lambda entry: -entry.cumulative_us,
+    )
+    print(f"\n{'app module':<32}{'cumulative ms':>14}{'self ms':>10}")
+    for entry in app_modules[: args.top]:
+        print(
+            f"{entry.module:<32}{entry.cumulative_us / 1000:>14.1f}"
+            f"{entry.self_us / 1000:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
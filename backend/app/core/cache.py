@@ -0,0 +1,113 @@
+import asyncio
+import importlib
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any, Generic, TypeVar, overload
+
+logger = logging.getLogger(__name__)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+T = TypeVar("T")
+
+
+class TTLCache(Generic[K, V]):
+    """
+    Bounded in-process cache with per-entry TTL and LRU eviction.
+
+    The cache is local to one worker process, so invalidation only reaches
+    the current worker; the TTL bounds how long other workers can serve a
+    stale entry.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @overload
+    def get(self, key: K) -> V | None: ...
+
+    @overload
+    def get(self, key: K, default: T) -> V | T: ...
+
+    def get(self, key: K, default: object = None) -> object:
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: K, value: V, ttl: float | None = None) -> None:
+        if self.maxsize <= 0:
+            return
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            self._data.pop(key, None)
+            return
+        self._data[key] = (time.monotonic() + ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def invalidate(self, key: K) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+class RedisInvalidations:
+    """
+    Broadcasts invalidations of a TTLCache to every worker over Redis
+    pub/sub, so an entry dropped by one worker is dropped by all of them.
+    """
+
+    def __init__(self, client: Any, channel: str, cache: TTLCache[str, Any]) -> None:
+        self._client = client
+        self.channel = channel
+        self.cache = cache
+
+    @classmethod
+    def from_url(
+        cls, url: str, channel: str, cache: TTLCache[str, Any]
+    ) -> "RedisInvalidations":
+        """Needs the ``redis`` package."""
+        try:
+            redis: Any = importlib.import_module("redis.asyncio")
+        except ImportError as e:
+            raise RuntimeError(
+                "Sharing cache invalidations requires the redis package"
+            ) from e
+        return cls(redis.from_url(url), channel, cache)
+
+    async def invalidate(self, key: str) -> None:
+        self.cache.invalidate(key)
+        await self._client.publish(self.channel, key)
+
+    async def run(self) -> None:
+        """Apply the invalidations published by any worker until cancelled."""
+        reconnecting = False
+        while True:
+            try:
+                async with self._client.pubsub() as pubsub:
+                    await pubsub.subscribe(self.channel)
+                    if reconnecting:
+                        # invalidations published while disconnected were missed
+                        self.cache.clear()
+                    reconnecting = True
+                    async for message in pubsub.listen():
+                        if message["type"] == "message":
+                            self.cache.invalidate(message["data"].decode())
+            except Exception:
+                logger.exception("Lost the cache invalidation channel")
+                await asyncio.sleep(1)
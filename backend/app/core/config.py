@@ -16,9 +16,10 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing_extensions import Self
 
 
-def parse_cors(v: Any) -> list[str] | str:
+def parse_list(v: Any) -> list[str] | str:
+    # comma-separated string, or a JSON list
     if isinstance(v, str) and not v.startswith("["):
-        return [i.strip() for i in v.split(",")]
+        return [i.strip() for i in v.split(",") if i.strip()]
     elif isinstance(v, list | str):
         return v
     raise ValueError(v)
@@ -36,9 +37,18 @@ class Settings(BaseSettings):
     # 60 minutes * 24 hours * 8 days = 8 days
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8
     ENVIRONMENT: Literal["local", "staging", "production"] = "local"
+    # Embed is_active/is_superuser/token version in access tokens and trust
+    # them instead of loading the user row on every authenticated request.
+    # Revocations (deactivation, demotion, password change, deletion) bump
+    # the user's token version in the DB; each worker caches versions for
+    # TOKEN_VERSION_CACHE_TTL_SECONDS, so old tokens keep working on other
+    # workers for up to that long
+    JWT_STATELESS_AUTH: bool = False
+    TOKEN_VERSION_CACHE_MAX_SIZE: int = 10_000
+    TOKEN_VERSION_CACHE_TTL_SECONDS: int = 30
 
     BACKEND_CORS_ORIGINS: Annotated[
-        list[AnyUrl] | str, BeforeValidator(parse_cors)
+        list[AnyUrl] | str, BeforeValidator(parse_list)
     ] = []
 
     @computed_field  # type: ignore[prop-decorator]
@@ -54,6 +64,68 @@ class Settings(BaseSettings):
     POSTGRES_PASSWORD: str = ""
     POSTGRES_DB: str = ""
 
+    # Optional read replicas ("host" or "host:port") sharing the primary's
+    # credentials and database; used by read-only endpoints
+    POSTGRES_REPLICA_SERVERS: Annotated[
+        list[str] | str, BeforeValidator(parse_list)
+    ] = []
+    DB_REPLICA_SELECTION: Literal["round_robin", "least_connections"] = "round_robin"
+    # How long an unreachable replica is skipped before it is tried again
+    DB_REPLICA_RETRY_SECONDS: int = 30
+
+    @computed_field  # type: ignore[prop-decorator]
+    @property
+    def SQLALCHEMY_REPLICA_URIS(self) -> list[PostgresDsn]:
+        uris = []
+        for server in self.POSTGRES_REPLICA_SERVERS:
+            host, _, port = server.partition(":")
+            uris.append(
+                MultiHostUrl.build(
+                    scheme="postgresql+psycopg",
+                    username=self.POSTGRES_USER,
+                    password=self.POSTGRES_PASSWORD,
+                    host=host,
+                    port=int(port) if port else self.POSTGRES_PORT,
+                    path=self.POSTGRES_DB,
+                )
+            )
+        return uris
+
+    # Connection pool, per worker process: the Dockerfile runs 4 workers, so
+    # the server needs 4 * (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800
+    # Costs a round trip per checkout; DB_POOL_RECYCLE already retires
+    # connections before typical server/proxy idle timeouts
+    DB_POOL_PRE_PING: bool = True
+    # psycopg server-side prepared statements: executions before a query is
+    # prepared (None disables preparing) and prepared statements kept per
+    # connection
+    DB_PREPARE_THRESHOLD: int | None = 5
+    DB_PREPARED_MAX: int = 100
+    # Pool connections opened at startup (at most DB_POOL_SIZE, 0 disables),
+    # each with the hot queries run enough times to be prepared
+    DB_WARMUP_CONNECTIONS: int = 5
+    DB_WARMUP_TIMEOUT_SECONDS: float = 10
+    # /utils/readiness/ pings the database at most once per
+    # HEALTH_CHECK_CACHE_SECONDS, and reports not ready when the ping fails
+    # or takes longer than HEALTH_CHECK_TIMEOUT_SECONDS, or when this share
+    # of DB_POOL_SIZE + DB_MAX_OVERFLOW connections is in use
+    HEALTH_CHECK_CACHE_SECONDS: float = 2
+    HEALTH_CHECK_TIMEOUT_SECONDS: float = 2
+    HEALTH_CHECK_MAX_POOL_SATURATION: float = 1.0
+    # Log a likely N+1 pattern when a request runs more statements than
+    # this; 0 disables the warning
+    DB_QUERY_COUNT_WARNING_THRESHOLD: int = 20
+
+    # Directory where worker processes share metrics; without it
+    # /utils/metrics only reports the worker serving the scrape
+    METRICS_MULTIPROC_DIR: str | None = None
+    # How often each worker publishes its metrics to METRICS_MULTIPROC_DIR
+    METRICS_SYNC_INTERVAL_SECONDS: float = 1.0
+
     @computed_field  # type: ignore[prop-decorator]
     @property
     def SQLALCHEMY_DATABASE_URI(self) -> PostgresDsn:
@@ -71,6 +143,63 @@ class Settings(BaseSettings):
 
     EMAIL_TEST_USER: str
 
+    # Pool used to run bcrypt off the event loop; PASSWORD_HASH_MAX_WORKERS
+    # caps how many hashes run at once per worker process
+    PASSWORD_HASH_EXECUTOR: Literal["thread", "process"] = "thread"
+    PASSWORD_HASH_MAX_WORKERS: int = 2
+
+    # Maximum number of entries accepted by batch endpoints
+    BATCH_MAX_SIZE: int = 1000
+    # Rows fetched per round trip by the export endpoints
+    EXPORT_BATCH_SIZE: int = 1000
+    # Rows validated and written per COPY by the import endpoints, and how
+    # many rejected rows the import summary details
+    IMPORT_BATCH_SIZE: int = 5000
+    IMPORT_MAX_ERRORS: int = 100
+
+    # How list endpoints fill `count`: exact count(*), the planner estimate
+    # from pg_class.reltuples, or an exact count cached per worker
+    LIST_COUNT_STRATEGY: Literal["exact", "estimated", "cached"] = "exact"
+    LIST_COUNT_CACHE_TTL_SECONDS: int = 30
+
+    # Key of the HMAC-SHA256 under which API keys are stored, SECRET_KEY
+    # when unset; changing it invalidates every issued API key
+    API_KEY_PEPPER: str | None = None
+    # In-process cache for X-API-Key lookups (per worker). Deactivating a
+    # key only drops it from the worker serving the DELETE: the others
+    # accept it for up to API_KEY_CACHE_TTL_SECONDS, unless
+    # API_KEY_CACHE_REDIS_URL is set to broadcast invalidations to all
+    # workers over Redis pub/sub
+    API_KEY_CACHE_MAX_SIZE: int = 10_000
+    API_KEY_CACHE_TTL_SECONDS: int = 15
+    API_KEY_CACHE_REDIS_URL: str | None = None
+    # Unknown keys are cached for a shorter time, so a key created through
+    # another worker becomes usable quickly
+    API_KEY_CACHE_NEGATIVE_TTL_SECONDS: int = 5
+    # Most recently used API keys loaded into the cache at startup
+    API_KEY_CACHE_WARMUP_SIZE: int = 1000
+    # How often each worker writes accumulated API key usage to the DB
+    API_KEY_USAGE_FLUSH_INTERVAL_SECONDS: float = 10.0
+
+    # Token-bucket rate limits in requests per minute, which is also the
+    # burst size. API keys can override theirs (0 disables the limit).
+    # "memory" buckets are per worker, so with 4 workers a client can get up
+    # to 4 times the limit; "redis" shares them between workers
+    RATE_LIMIT_ENABLED: bool = True
+    RATE_LIMIT_BACKEND: Literal["memory", "redis"] = "memory"
+    RATE_LIMIT_REDIS_URL: str | None = None
+    RATE_LIMIT_MEMORY_MAX_KEYS: int = 100_000
+    RATE_LIMIT_API_KEY_PER_MINUTE: int = 600
+    RATE_LIMIT_USER_PER_MINUTE: int = 300
+
+    # Cache of item read responses. "memory" is per worker: a write only
+    # invalidates the worker that served it, others can serve stale
+    # responses for up to RESPONSE_CACHE_TTL_SECONDS; "redis" is shared
+    RESPONSE_CACHE_BACKEND: Literal["none", "memory", "redis"] = "none"
+    RESPONSE_CACHE_REDIS_URL: str | None = None
+    RESPONSE_CACHE_MAX_SIZE: int = 1024
+    RESPONSE_CACHE_TTL_SECONDS: int = 30
+
     def _check_default_secret(self, var_name: str, value: str | None) -> None:
         if value == "changethis":
             message = (
@@ -92,5 +221,34 @@ class Settings(BaseSettings):
 
         return self
 
+    @model_validator(mode="after")
+    def _check_api_key_secret(self) -> Self:
+        # A generated SECRET_KEY differs per worker and restart, so API key
+        # hashes stored under it would never match again
+        if self.API_KEY_PEPPER is None and "SECRET_KEY" not in self.model_fields_set:
+            message = (
+                "API keys are hashed with SECRET_KEY when API_KEY_PEPPER is "
+                "unset, and SECRET_KEY is generated per process: set one of "
+                "them, or stored API keys won't match across workers and "
+                "restarts."
+            )
+            if self.ENVIRONMENT == "local":
+                warnings.warn(message, stacklevel=1)
+            else:
+                raise ValueError(message)
+        return self
+
+    @model_validator(mode="after")
+    def _check_redis_urls(self) -> Self:
+        if self.RESPONSE_CACHE_BACKEND == "redis" and not self.RESPONSE_CACHE_REDIS_URL:
+            raise ValueError(
+                "RESPONSE_CACHE_REDIS_URL is required when RESPONSE_CACHE_BACKEND=redis"
+            )
+        if self.RATE_LIMIT_BACKEND == "redis" and not self.RATE_LIMIT_REDIS_URL:
+            raise ValueError(
+                "RATE_LIMIT_REDIS_URL is required when RATE_LIMIT_BACKEND=redis"
+            )
+        return self
+
 
 settings = Settings()  # type: ignore
@@ -0,0 +1,292 @@
+import json
+import os
+import time
+from bisect import bisect_left
+from collections.abc import Callable, Container, Iterable, Sequence
+from pathlib import Path
+from typing import Any, Literal
+
+from app.core.config import settings
+
+# Upper bounds in seconds
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.001,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class Histogram:
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        # last slot counts observations above the largest bucket (+Inf)
+        self.bucket_counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.bucket_counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> list[tuple[float, int]]:
+        """(upper bound, observations <= bound) pairs, ending with +Inf."""
+        result = []
+        total = 0
+        for bound, count in zip(
+            (*self.buckets, float("inf")), self.bucket_counts, strict=True
+        ):
+            total += count
+            result.append((bound, total))
+        return result
+
+
+Labels = tuple[tuple[str, str], ...]
+MetricKind = Literal["counter", "gauge", "histogram"]
+
+
+class Metric:
+    """
+    A labelled counter, gauge or histogram.
+
+    Counters and gauges can instead be read from ``callback`` when the value
+    is already tracked elsewhere.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        kind: MetricKind,
+        help: str,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+        callback: Callable[[], float] | None = None,
+    ) -> None:
+        self.name = name
+        self.kind = kind
+        self.help = help
+        self.buckets = buckets
+        self.callback = callback
+        self.values: dict[Labels, float] = {}
+        self.histograms: dict[Labels, Histogram] = {}
+
+    def inc(self, value: float = 1.0, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        self.values[key] = self.values.get(key, 0.0) + value
+
+    def dec(self, value: float = 1.0, **labels: str) -> None:
+        self.inc(-value, **labels)
+
+    def labels(self, **labels: str) -> Histogram:
+        key = tuple(sorted(labels.items()))
+        histogram = self.histograms.get(key)
+        if histogram is None:
+            histogram = self.histograms[key] = Histogram(self.buckets)
+        return histogram
+
+    def observe(self, value: float, **labels: str) -> None:
+        self.labels(**labels).observe(value)
+
+    def samples(self) -> list[list[Any]]:
+        if self.kind == "histogram":
+            return [
+                [list(key), list(h.buckets), h.bucket_counts, h.sum, h.count]
+                for key, h in self.histograms.items()
+            ]
+        if self.callback is not None:
+            return [[[], self.callback()]]
+        return [[list(key), value] for key, value in self.values.items()]
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self.metrics: dict[str, Metric] = {}
+
+    def _register(self, metric: Metric) -> Metric:
+        if metric.name in self.metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self.metrics[metric.name] = metric
+        return metric
+
+    def counter(
+        self, name: str, help: str, callback: Callable[[], float] | None = None
+    ) -> Metric:
+        return self._register(Metric(name, "counter", help, callback=callback))
+
+    def gauge(
+        self, name: str, help: str, callback: Callable[[], float] | None = None
+    ) -> Metric:
+        return self._register(Metric(name, "gauge", help, callback=callback))
+
+    def histogram(
+        self, name: str, help: str, buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Metric:
+        return self._register(Metric(name, "histogram", help, buckets=buckets))
+
+    def snapshot(self) -> dict[str, Any]:
+        """JSON-serialisable state of this process."""
+        return {
+            "pid": os.getpid(),
+            "metrics": {
+                name: {
+                    "kind": metric.kind,
+                    "help": metric.help,
+                    "samples": metric.samples(),
+                }
+                for name, metric in self.metrics.items()
+            },
+        }
+
+
+def merge_snapshots(
+    snapshots: Iterable[dict[str, Any]], live_pids: Container[int]
+) -> dict[str, Any]:
+    """
+    Sum the snapshots of several worker processes.
+
+    Counters and histograms of exited workers are kept so totals never go
+    backwards; gauges only count workers that are still running.
+    """
+    merged: dict[str, Any] = {}
+    for snapshot in snapshots:
+        is_live = snapshot["pid"] in live_pids
+        for name, data in snapshot["metrics"].items():
+            if data["kind"] == "gauge" and not is_live:
+                continue
+            target = merged.setdefault(
+                name, {"kind": data["kind"], "help": data["help"], "samples": {}}
+            )
+            for sample in data["samples"]:
+                key = tuple(tuple(label) for label in sample[0])
+                if data["kind"] != "histogram":
+                    target["samples"][key] = target["samples"].get(key, 0.0) + sample[1]
+                    continue
+                _, buckets, counts, total, count = sample
+                current = target["samples"].get(key)
+                if current is None:
+                    target["samples"][key] = [buckets, list(counts), total, count]
+                else:
+                    current[1] = [
+                        a + b for a, b in zip(current[1], counts, strict=True)
+                    ]
+                    current[2] += total
+                    current[3] += count
+    return merged
+
+
+def _format_labels(labels: Iterable[tuple[str, str]]) -> str:
+    parts = [
+        '{}="{}"'.format(
+            name,
+            value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"'),
+        )
+        for name, value in labels
+    ]
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def render_text(merged: dict[str, Any]) -> str:
+    """Prometheus text exposition format (0.0.4)."""
+    lines: list[str] = []
+    for name, data in sorted(merged.items()):
+        lines.append(f"# HELP {name} {data['help']}")
+        lines.append(f"# TYPE {name} {data['kind']}")
+        for key, sample in sorted(data["samples"].items()):
+            if data["kind"] != "histogram":
+                lines.append(f"{name}{_format_labels(key)} {_format_value(sample)}")
+                continue
+            buckets, counts, total, count = sample
+            cumulative = 0
+            for bound, bucket_count in zip(
+                (*buckets, float("inf")), counts, strict=True
+            ):
+                cumulative += bucket_count
+                labels = _format_labels((*key, ("le", _format_value(bound))))
+                lines.append(f"{name}_bucket{labels} {cumulative}")
+            lines.append(f"{name}_sum{_format_labels(key)} {_format_value(total)}")
+            lines.append(f"{name}_count{_format_labels(key)} {count}")
+    return "\n".join(lines) + "\n"
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class MultiprocessStore:
+    """
+    Shares metrics between worker processes through a directory.
+
+    Each worker writes its snapshot to ``<directory>/<pid>.json`` at most
+    once per ``sync_interval`` (from the request path) and whenever it
+    serves a scrape; the scraping worker merges all files. Without a
+    directory only the current process is reported.
+    """
+
+    def __init__(
+        self, registry: MetricsRegistry, directory: str | None, sync_interval: float
+    ) -> None:
+        self.registry = registry
+        self.directory = Path(directory) if directory else None
+        self.sync_interval = sync_interval
+        self._synced_at = 0.0
+
+    def maybe_sync(self) -> None:
+        if (
+            self.directory is not None
+            and time.monotonic() - self._synced_at >= self.sync_interval
+        ):
+            self.sync()
+
+    def sync(self) -> None:
+        if self.directory is None:
+            return
+        self.directory.mkdir(parents=True, exist_ok=True)
+        pid = os.getpid()
+        tmp_path = self.directory / f".{pid}.json.tmp"
+        tmp_path.write_text(json.dumps(self.registry.snapshot()))
+        # os.replace is atomic, readers never see a partial file
+        os.replace(tmp_path, self.directory / f"{pid}.json")
+        self._synced_at = time.monotonic()
+
+    def collect(self) -> str:
+        if self.directory is None:
+            snapshot = self.registry.snapshot()
+            return render_text(merge_snapshots([snapshot], {snapshot["pid"]}))
+        self.sync()
+        snapshots = []
+        for path in self.directory.glob("*.json"):
+            try:
+                snapshots.append(json.loads(path.read_text()))
+            except (OSError, ValueError):
+                # file removed or replaced while reading
+                continue
+        live_pids = {s["pid"] for s in snapshots if _pid_alive(s["pid"])}
+        return render_text(merge_snapshots(snapshots, live_pids))
+
+
+metrics = MetricsRegistry()
+metrics_store = MultiprocessStore(
+    metrics,
+    directory=settings.METRICS_MULTIPROC_DIR,
+    sync_interval=settings.METRICS_SYNC_INTERVAL_SECONDS,
+)
@@ -0,0 +1,129 @@
+import importlib
+import math
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any, Protocol
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+
+@dataclass
+class RateLimitResult:
+    allowed: bool
+    limit: int
+    remaining: int
+    # seconds until the bucket is full again
+    reset_seconds: float
+    # seconds until the next request is allowed, 0 when allowed
+    retry_after: float
+
+    def headers(self) -> dict[str, str]:
+        headers = {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(self.remaining),
+            "X-RateLimit-Reset": str(math.ceil(self.reset_seconds)),
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(math.ceil(self.retry_after))
+        return headers
+
+
+def _result(allowed: bool, tokens: float, per_minute: int) -> RateLimitResult:
+    rate = per_minute / 60
+    return RateLimitResult(
+        allowed=allowed,
+        limit=per_minute,
+        remaining=math.floor(tokens),
+        reset_seconds=(per_minute - tokens) / rate,
+        retry_after=0.0 if allowed else (1 - tokens) / rate,
+    )
+
+
+class RateLimitBackend(Protocol):
+    async def acquire(self, key: str, per_minute: int) -> RateLimitResult:
+        """Take one token from the bucket of ``key``."""
+        ...
+
+
+class MemoryRateLimitBackend:
+    """
+    Token buckets in the worker process. Each worker enforces the limit on
+    its own, so with N workers a client can get up to N times the limit.
+    """
+
+    def __init__(
+        self, maxsize: int, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self._clock = clock
+        # key -> (tokens, updated at); an evicted or expired bucket is full
+        self._buckets: TTLCache[str, tuple[float, float]] = TTLCache(
+            maxsize=maxsize, ttl=60
+        )
+
+    async def acquire(self, key: str, per_minute: int) -> RateLimitResult:
+        now = self._clock()
+        rate = per_minute / 60
+        tokens, updated_at = self._buckets.get(key, (float(per_minute), now))
+        tokens = min(per_minute, tokens + (now - updated_at) * rate)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        # a bucket left alone refills completely within a minute
+        self._buckets.set(key, (tokens, now))
+        return _result(allowed, tokens, per_minute)
+
+
+# KEYS[1] bucket, ARGV[1] capacity (requests per minute); uses the server
+# clock so all workers agree on the refill
+_TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = capacity / 60
+local time = redis.call('TIME')
+local now = tonumber(time[1]) + tonumber(time[2]) / 1000000
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1]) or capacity
+local ts = tonumber(bucket[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], 60)
+return {allowed, tostring(tokens)}
+"""
+
+
+class RedisRateLimitBackend:
+    """
+    Token buckets on a Redis-compatible server, shared by all workers;
+    each check is one atomic script call. Needs the ``redis`` package.
+    """
+
+    def __init__(self, url: str) -> None:
+        try:
+            redis: Any = importlib.import_module("redis.asyncio")
+        except ImportError as e:
+            raise RuntimeError(
+                "RATE_LIMIT_BACKEND=redis requires the redis package"
+            ) from e
+        client = redis.from_url(url)
+        self._script = client.register_script(_TOKEN_BUCKET_SCRIPT)
+
+    async def acquire(self, key: str, per_minute: int) -> RateLimitResult:
+        allowed, tokens = await self._script(
+            keys=[f"rate_limit:{key}"], args=[per_minute]
+        )
+        return _result(bool(allowed), float(tokens), per_minute)
+
+
+def create_backend() -> RateLimitBackend:
+    if settings.RATE_LIMIT_BACKEND == "redis":
+        return RedisRateLimitBackend(str(settings.RATE_LIMIT_REDIS_URL))
+    return MemoryRateLimitBackend(maxsize=settings.RATE_LIMIT_MEMORY_MAX_KEYS)
+
+
+rate_limit_backend = create_backend()
@@ -0,0 +1,165 @@
+import hashlib
+import importlib
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any, Protocol
+
+from fastapi import Request, Response
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+
+class CacheBackend(Protocol):
+    async def get(self, key: str) -> bytes | None: ...
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None: ...
+
+    async def generation(self, namespace: str) -> int: ...
+
+    async def bump_generation(self, namespace: str) -> None: ...
+
+
+class MemoryBackend:
+    """
+    LRU cache local to the worker process: invalidation does not reach
+    other workers, which keep serving their entries until the TTL expires.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self._entries: TTLCache[str, bytes] = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._generations: dict[str, int] = {}
+
+    async def get(self, key: str) -> bytes | None:
+        return self._entries.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        self._entries.set(key, value, ttl)
+
+    async def generation(self, namespace: str) -> int:
+        return self._generations.get(namespace, 0)
+
+    async def bump_generation(self, namespace: str) -> None:
+        self._generations[namespace] = self._generations.get(namespace, 0) + 1
+
+
+class RedisBackend:
+    """
+    Shared cache on a Redis-compatible server (Redis, Valkey, KeyDB...),
+    so invalidation reaches all workers. Needs the ``redis`` package.
+    """
+
+    def __init__(self, url: str) -> None:
+        try:
+            redis: Any = importlib.import_module("redis.asyncio")
+        except ImportError as e:
+            raise RuntimeError(
+                "RESPONSE_CACHE_BACKEND=redis requires the redis package"
+            ) from e
+        self._client = redis.from_url(url)
+
+    async def get(self, key: str) -> bytes | None:
+        value: bytes | None = await self._client.get(key)
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await self._client.set(key, value, px=int(ttl * 1000))
+
+    async def generation(self, namespace: str) -> int:
+        return int(await self._client.get(f"{namespace}:generation") or 0)
+
+    async def bump_generation(self, namespace: str) -> None:
+        await self._client.incr(f"{namespace}:generation")
+
+
+def make_etag(*parts: Any) -> str:
+    digest = hashlib.sha256(repr(parts).encode()).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+@dataclass
+class CachedResponse:
+    etag: str
+    body: bytes
+
+    def to_bytes(self) -> bytes:
+        return self.etag.encode() + b"\n" + self.body
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "CachedResponse":
+        etag, _, body = data.partition(b"\n")
+        return cls(etag=etag.decode(), body=body)
+
+    def to_response(self, request: Request) -> Response:
+        if etag_matches(request, self.etag):
+            return Response(status_code=304, headers={"ETag": self.etag})
+        return Response(
+            content=self.body,
+            media_type="application/json",
+            headers={"ETag": self.etag},
+        )
+
+
+class ResponseCache:
+    """
+    Caches JSON responses per path and query string within a namespace.
+
+    Entries are keyed by the namespace generation, so ``invalidate`` drops
+    every entry of the namespace at once by bumping it; a response built
+    from data read before the bump is stored under the old generation and
+    never served. Without a backend responses are built on every request,
+    but still carry an ETag and answer ``If-None-Match``.
+    """
+
+    def __init__(
+        self, backend: CacheBackend | None, namespace: str, ttl: float
+    ) -> None:
+        self.backend = backend
+        self.namespace = namespace
+        self.ttl = ttl
+
+    async def respond(
+        self, request: Request, build: Callable[[], Awaitable[CachedResponse]]
+    ) -> Response:
+        if self.backend is None:
+            return (await build()).to_response(request)
+
+        generation = await self.backend.generation(self.namespace)
+        query = "&".join(sorted(str(request.query_params).split("&")))
+        key = f"{self.namespace}:{generation}:{request.url.path}?{query}"
+        data = await self.backend.get(key)
+        if data is not None:
+            entry = CachedResponse.from_bytes(data)
+        else:
+            entry = await build()
+            await self.backend.set(key, entry.to_bytes(), self.ttl)
+        return entry.to_response(request)
+
+    async def invalidate(self) -> None:
+        if self.backend is not None:
+            await self.backend.bump_generation(self.namespace)
+
+
+def create_backend() -> CacheBackend | None:
+    if settings.RESPONSE_CACHE_BACKEND == "memory":
+        return MemoryBackend(
+            maxsize=settings.RESPONSE_CACHE_MAX_SIZE,
+            ttl=settings.RESPONSE_CACHE_TTL_SECONDS,
+        )
+    if settings.RESPONSE_CACHE_BACKEND == "redis":
+        return RedisBackend(str(settings.RESPONSE_CACHE_REDIS_URL))
+    return None
+
+
+response_cache_backend = create_backend()
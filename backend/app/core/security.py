@@ -1,27 +1,124 @@
+import asyncio
+import functools
+import hashlib
+import hmac
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Any
+from typing import TYPE_CHECKING, Any, Literal, TypeVar
 
 import jwt
-from passlib.context import CryptContext
 
 from app.core.config import settings
+from app.core.metrics import metrics
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
 
 
 ALGORITHM = "HS256"
 
+# Leading characters of an API key stored in clear to identify it
+API_KEY_PREFIX_LENGTH = 8
 
-def create_access_token(subject: str | Any, expires_delta: timedelta) -> str:
+T = TypeVar("T")
+
+
+def create_access_token(
+    subject: str | Any,
+    expires_delta: timedelta,
+    claims: dict[str, Any] | None = None,
+) -> str:
     expire = datetime.now(timezone.utc) + expires_delta
-    to_encode = {"exp": expire, "sub": str(subject)}
+    to_encode = {**(claims or {}), "exp": expire, "sub": str(subject)}
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
 
+@functools.cache
+def get_pwd_context() -> "CryptContext":
+    # passlib is imported on the first password check rather than at startup
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
+
+
+def hash_api_key(raw_key: str) -> str:
+    # API keys are random 256-bit tokens, so a keyed fast hash is enough;
+    # bcrypt would only slow down every request
+    pepper = settings.API_KEY_PEPPER or settings.SECRET_KEY
+    return hmac.new(pepper.encode(), raw_key.encode(), hashlib.sha256).hexdigest()
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt off the event loop in a bounded thread or process pool.
+
+    At most ``max_workers`` hashes run at once; further calls wait in the
+    pool queue and are reported by ``queue_depth``.
+    """
+
+    def __init__(
+        self, executor: Literal["thread", "process"], max_workers: int
+    ) -> None:
+        self.executor_kind = executor
+        self.max_workers = max_workers
+        self.in_flight = 0
+        self._executor: Executor | None = None
+
+    @property
+    def queue_depth(self) -> int:
+        return max(0, self.in_flight - self.max_workers)
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.executor_kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="bcrypt"
+                )
+        return self._executor
+
+    async def _run(self, fn: Callable[..., T], *args: Any) -> T:
+        loop = asyncio.get_running_loop()
+        self.in_flight += 1
+        try:
+            return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            self.in_flight -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    executor=settings.PASSWORD_HASH_EXECUTOR,
+    max_workers=settings.PASSWORD_HASH_MAX_WORKERS,
+)
+metrics.gauge(
+    "password_hash_in_flight",
+    "bcrypt hashes running or queued",
+    callback=lambda: password_hasher.in_flight,
+)
+metrics.gauge(
+    "password_hash_queue_depth",
+    "bcrypt hashes waiting for a pool worker",
+    callback=lambda: password_hasher.queue_depth,
+)
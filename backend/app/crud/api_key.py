@@ -1,35 +1,97 @@
+import asyncio
+import logging
+import uuid
+from collections.abc import Mapping, Sequence
+from datetime import datetime
 from secrets import token_urlsafe
 
-from sqlalchemy import select
+from sqlalchemy import BigInteger, column, func, or_, select, update, values
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import RedisInvalidations, TTLCache
+from app.core.config import settings
+from app.core.security import API_KEY_PREFIX_LENGTH, hash_api_key
 from app.crud.base import CRUDCreateOnly
+from app.db.session import AsyncSessionLocal
 from app.models.api_key import APIKey
 from app.schemas.api_key import APIKeyCreate
 
+logger = logging.getLogger(__name__)
+
+# key hash -> resolved record, ``None`` for keys that are unknown or inactive
+api_key_cache: TTLCache[str, APIKey | None] = TTLCache(
+    maxsize=settings.API_KEY_CACHE_MAX_SIZE,
+    ttl=settings.API_KEY_CACHE_TTL_SECONDS,
+)
+
+api_key_invalidations = (
+    RedisInvalidations.from_url(
+        settings.API_KEY_CACHE_REDIS_URL,
+        channel="api_keys:invalidate",
+        cache=api_key_cache,
+    )
+    if settings.API_KEY_CACHE_REDIS_URL
+    else None
+)
+
+
+async def invalidate_api_key(key_hash: str) -> None:
+    """Drop a key from the cache of this worker, and of all workers when
+    invalidations are shared."""
+    if api_key_invalidations is None:
+        api_key_cache.invalidate(key_hash)
+        return
+    try:
+        await api_key_invalidations.invalidate(key_hash)
+    except Exception:
+        # the other workers still drop it after API_KEY_CACHE_TTL_SECONDS
+        logger.exception("Failed to broadcast the invalidation of an API key")
+
+
+def cache_api_key(key_obj: APIKey) -> None:
+    # expiring keys are not cached past their expiry
+    if key_obj.expires_at is None:
+        api_key_cache.set(key_obj.key_hash, key_obj)
+    else:
+        ttl = (key_obj.expires_at - datetime.now()).total_seconds()
+        api_key_cache.set(key_obj.key_hash, key_obj, ttl=ttl)
+
 
 class CRUDAPIKey(CRUDCreateOnly[APIKey, APIKeyCreate]):
     async def create(self, session: AsyncSession, obj_in: APIKeyCreate) -> APIKey:
+        db_key, _ = await self.create_with_key(session, obj_in)
+        return db_key
+
+    async def create_with_key(
+        self, session: AsyncSession, obj_in: APIKeyCreate
+    ) -> tuple[APIKey, str]:
+        """
+        Create a key; the plain key is returned once and only its hash is
+        stored.
+        """
         # генерируем 256-битный токен
-        # TODO : hash token in DB
         key_plain = token_urlsafe(32)
+        key_hash = hash_api_key(key_plain)
 
         db_key = self.model(
             name=obj_in.name,
-            key=key_plain,
+            key_hash=key_hash,
+            key_prefix=key_plain[:API_KEY_PREFIX_LENGTH],
             expires_at=obj_in.expires_at,
+            rate_limit=obj_in.rate_limit,
         )
 
         session.add(db_key)
         await session.commit()
         await session.refresh(db_key)
-        return db_key
+        api_key_cache.invalidate(key_hash)
+        return db_key, key_plain
 
-    async def get(self, session: AsyncSession, raw_key: str) -> APIKey | None:
+    async def get(self, session: AsyncSession, key_hash: str) -> APIKey | None:
         stmt = (
             select(self.model)
             .where(
-                self.model.key == raw_key,
+                self.model.key_hash == key_hash,
                 self.model.is_active.is_(True),
             )
             .limit(1)
@@ -37,5 +99,113 @@ class CRUDAPIKey(CRUDCreateOnly[APIKey, APIKeyCreate]):
         result = await session.scalars(stmt)
         return result.first()
 
+    async def get_recently_used(
+        self, session: AsyncSession, limit: int
+    ) -> Sequence[APIKey]:
+        """Active, unexpired keys, most recently used first."""
+        stmt = (
+            select(self.model)
+            .where(
+                self.model.is_active.is_(True),
+                or_(
+                    self.model.expires_at.is_(None),
+                    self.model.expires_at > func.localtimestamp(),
+                ),
+            )
+            .order_by(self.model.last_used_at.desc().nulls_last())
+            .limit(limit)
+        )
+        result = await session.scalars(stmt)
+        return result.all()
+
+    async def deactivate(self, session: AsyncSession, id: uuid.UUID) -> APIKey | None:
+        db_key = await session.get(self.model, id)
+        if db_key is None:
+            return None
+        db_key.is_active = False
+        await session.commit()
+        await invalidate_api_key(db_key.key_hash)
+        return db_key
+
+    async def record_usage(
+        self, session: AsyncSession, usage: Mapping[uuid.UUID, tuple[int, datetime]]
+    ) -> None:
+        """
+        Add request counts and advance last_used_at of many keys in one
+        UPDATE ... FROM (VALUES ...); ``usage`` maps key ids to
+        (requests, last used at).
+        """
+        if not usage:
+            return
+        table = self.model.__table__
+        data = values(
+            column("id", table.c.id.type),
+            column("requests", BigInteger()),
+            column("last_used_at", table.c.last_used_at.type),
+            name="usage",
+        ).data([(id, requests, used_at) for id, (requests, used_at) in usage.items()])
+        stmt = (
+            update(self.model)
+            .where(table.c.id == data.c.id)
+            .values(
+                request_count=table.c.request_count + data.c.requests,
+                # GREATEST ignores NULL; workers may flush out of order
+                last_used_at=func.greatest(table.c.last_used_at, data.c.last_used_at),
+                # usage is not a change of the key itself
+                date_updated=table.c.date_updated,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await session.execute(stmt)
+        await session.commit()
+
 
 api_crud = CRUDAPIKey(APIKey)
+
+
+class APIKeyUsageTracker:
+    """
+    Accumulates API key usage in memory and writes it periodically in one
+    statement, so the request path never writes to api_keys.
+
+    Usage recorded since the last flush is lost if the worker dies without
+    going through shutdown.
+    """
+
+    def __init__(self) -> None:
+        self._pending: dict[uuid.UUID, tuple[int, datetime]] = {}
+
+    def record(self, key_id: uuid.UUID) -> None:
+        requests, _ = self._pending.get(key_id, (0, None))
+        self._pending[key_id] = (requests + 1, datetime.now())
+
+    def _restore(self, usage: Mapping[uuid.UUID, tuple[int, datetime]]) -> None:
+        for key_id, (requests, used_at) in usage.items():
+            newer = self._pending.get(key_id)
+            if newer is not None:
+                requests, used_at = requests + newer[0], max(used_at, newer[1])
+            self._pending[key_id] = (requests, used_at)
+
+    async def flush(self) -> None:
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        try:
+            async with AsyncSessionLocal() as session:
+                await api_crud.record_usage(session, pending)
+        except BaseException:
+            # keep the counts for the next flush
+            self._restore(pending)
+            raise
+
+    async def run(self, interval: float) -> None:
+        """Flush every ``interval`` seconds until cancelled."""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Failed to flush API key usage")
+
+
+api_key_usage = APIKeyUsageTracker()
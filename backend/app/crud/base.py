@@ -1,32 +1,168 @@
-from collections.abc import Sequence
-from typing import Any, Generic, TypeVar
+import base64
+import binascii
+import json
+import uuid
+from collections.abc import AsyncIterable, AsyncIterator, Mapping, Sequence
+from datetime import datetime
+from typing import Any, Generic, Literal, TypeVar
 
+import psycopg.sql
 from pydantic import BaseModel
-from sqlalchemy import select
+from sqlalchemy import (
+    ColumnElement,
+    column,
+    delete,
+    func,
+    insert,
+    select,
+    text,
+    tuple_,
+    update,
+    values,
+)
 from sqlalchemy.engine.result import ScalarResult
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import TTLCache
+from app.core.config import settings
 from app.db.base import Base
 
 ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
+CountStrategy = Literal["exact", "estimated", "cached"]
+
+# table name -> row count, for the "cached" count strategy
+count_cache: TTLCache[str, int] = TTLCache(
+    maxsize=128, ttl=settings.LIST_COUNT_CACHE_TTL_SECONDS
+)
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps(list(values), default=str, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, length: int) -> list[Any]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursorError(cursor)
+    if not isinstance(values, list) or len(values) != length:
+        raise InvalidCursorError(cursor)
+    return values
+
 
 class CRUDOnlyRead(Generic[ModelType]):
+    # Stable sort key for listings, also used as the keyset for cursors
+    keyset_columns: tuple[str, ...] = ("date_created", "id")
+
     def __init__(self, model: type[ModelType]):
         self.model = model
 
+    @property
+    def _keyset(self) -> list[ColumnElement[Any]]:
+        return [self.model.__table__.c[name] for name in self.keyset_columns]
+
     async def get(self, session: AsyncSession, id: Any) -> ModelType | None:
         return await session.get(self.model, id)
 
+    async def count(
+        self, db: AsyncSession, *, strategy: CountStrategy | None = None
+    ) -> int:
+        strategy = strategy or settings.LIST_COUNT_STRATEGY
+        table_name: str = self.model.__tablename__
+        if strategy == "estimated":
+            estimate = await db.scalar(
+                text(
+                    "SELECT reltuples::bigint FROM pg_class "
+                    "WHERE oid = to_regclass(:name)"
+                ),
+                {"name": f'"{table_name}"'},
+            )
+            # -1 until the table has been vacuumed or analyzed
+            if estimate is not None and estimate >= 0:
+                return int(estimate)
+        elif strategy == "cached":
+            cached = count_cache.get(table_name)
+            if cached is not None:
+                return cached
+        count_result = await db.execute(select(func.count()).select_from(self.model))
+        count: int = count_result.scalar_one()
+        if strategy == "cached":
+            count_cache.set(table_name, count)
+        return count
+
+    def invalidate_count(self) -> None:
+        count_cache.invalidate(self.model.__tablename__)
+
     async def get_multi(
         self, db: AsyncSession, *, skip: int = 0, limit: int = 100
     ) -> Sequence[ModelType]:
-        stmt = select(self.model).offset(skip).limit(limit)
+        stmt = select(self.model).order_by(*self._keyset).offset(skip).limit(limit)
         result: ScalarResult[ModelType] = await db.scalars(stmt)
         return result.all()
 
+    async def get_page(
+        self, db: AsyncSession, *, limit: int = 100, cursor: str | None = None
+    ) -> tuple[Sequence[ModelType], str | None]:
+        """
+        Keyset pagination: returns up to ``limit`` rows following ``cursor``
+        and the opaque cursor of the next page (``None`` on the last page).
+        """
+        if limit <= 0:
+            return [], None
+        keyset = self._keyset
+        stmt = select(self.model).order_by(*keyset).limit(limit + 1)
+        if cursor:
+            after = [
+                self._parse_cursor_value(column, value)
+                for column, value in zip(
+                    keyset, decode_cursor(cursor, len(keyset)), strict=True
+                )
+            ]
+            stmt = stmt.where(tuple_(*keyset) > tuple_(*after))
+        result: ScalarResult[ModelType] = await db.scalars(stmt)
+        rows = result.all()
+        if len(rows) <= limit:
+            return rows, None
+        rows = rows[:limit]
+        last = rows[-1]
+        return rows, encode_cursor(
+            [getattr(last, name) for name in self.keyset_columns]
+        )
+
+    async def stream(
+        self, db: AsyncSession, *, batch_size: int = 1000
+    ) -> AsyncIterator[Sequence[ModelType]]:
+        """
+        All rows in listing order, fetched ``batch_size`` at a time through a
+        server-side cursor; the session is busy until iteration ends.
+        """
+        result = await db.stream_scalars(
+            select(self.model)
+            .order_by(*self._keyset)
+            .execution_options(yield_per=batch_size)
+        )
+        async for batch in result.partitions():
+            yield batch
+
+    @staticmethod
+    def _parse_cursor_value(column: ColumnElement[Any], value: Any) -> Any:
+        python_type = column.type.python_type
+        try:
+            if python_type is datetime:
+                return datetime.fromisoformat(value)
+            return python_type(value)
+        except (TypeError, ValueError):
+            raise InvalidCursorError(value)
+
 
 class CRUDCreateOnly(CRUDOnlyRead[ModelType], Generic[ModelType, CreateSchemaType]):
     def __init__(self, model: type[ModelType]):
@@ -39,8 +175,76 @@ class CRUDCreateOnly(CRUDOnlyRead[ModelType], Generic[ModelType, CreateSchemaTyp
         session.add(obj)
         await session.commit()
         await session.refresh(obj)
+        self.invalidate_count()
         return obj
 
+    async def create_many(
+        self, session: AsyncSession, objs_in: Sequence[CreateSchemaType]
+    ) -> Sequence[ModelType]:
+        """
+        Insert all rows with a multi-row INSERT ... RETURNING in one
+        transaction; results are in the order of ``objs_in``.
+        """
+        if not objs_in:
+            return []
+        stmt = (
+            insert(self.model)
+            .returning(self.model, sort_by_parameter_order=True)
+            .execution_options(render_nulls=True)
+        )
+        result = await session.scalars(stmt, [obj.model_dump() for obj in objs_in])
+        objs = result.all()
+        await session.commit()
+        self.invalidate_count()
+        return objs
+
+    async def copy_many(
+        self,
+        session: AsyncSession,
+        batches: AsyncIterable[Sequence[CreateSchemaType]],
+    ) -> int:
+        """
+        Load rows with a single COPY ... FROM STDIN in the session's
+        transaction, without committing; returns the number of rows written.
+        Batches are sent as they come, so only one is held in memory.
+
+        Columns are filled by name from the schema fields, NULL when
+        missing; nothing is returned, unlike ``create_many``.
+        """
+        table = self.model.__table__
+        fields = [
+            c.name
+            for c in table.columns
+            if c.computed is None
+            and c.name not in ("id", "date_created", "date_updated")
+        ]
+        conn = await session.connection()
+        # the mixin's date defaults are SQL-side; COPY needs literal values
+        now = await conn.scalar(select(func.localtimestamp()))
+        driver = (await conn.get_raw_connection()).driver_connection
+        assert driver is not None
+        statement = psycopg.sql.SQL("COPY {} ({}) FROM STDIN").format(
+            psycopg.sql.Identifier(self.model.__tablename__),
+            psycopg.sql.SQL(", ").join(
+                map(
+                    psycopg.sql.Identifier,
+                    ["id", "date_created", "date_updated", *fields],
+                )
+            ),
+        )
+        count = 0
+        async with driver.cursor() as cursor:
+            async with cursor.copy(statement) as copy:
+                async for batch in batches:
+                    for obj in batch:
+                        data = obj.model_dump()
+                        await copy.write_row(
+                            [uuid.uuid4(), now, now, *(data.get(f) for f in fields)]
+                        )
+                    count += len(batch)
+        self.invalidate_count()
+        return count
+
 
 class CRUDUpdateOnly(CRUDOnlyRead[ModelType], Generic[ModelType, UpdateSchemaType]):
     def __init__(self, model: type[ModelType]):
@@ -56,6 +260,78 @@ class CRUDUpdateOnly(CRUDOnlyRead[ModelType], Generic[ModelType, UpdateSchemaTyp
         await session.refresh(db_obj)
         return db_obj
 
+    async def update_by_id(
+        self, session: AsyncSession, id: Any, obj_in: UpdateSchemaType
+    ) -> ModelType | None:
+        """
+        UPDATE ... RETURNING in a single statement, without loading the row
+        first; returns ``None`` when no row has this id.
+        """
+        update_data = obj_in.model_dump(exclude_unset=True)
+        if not update_data:
+            return await self.get(session, id)
+        table = self.model.__table__
+        stmt = (
+            update(self.model)
+            .where(table.c.id == id)
+            .values(update_data)
+            .returning(*table.c)
+        )
+        result = await session.scalars(
+            select(self.model)
+            .from_statement(stmt)
+            .execution_options(populate_existing=True)
+        )
+        obj: ModelType | None = result.first()
+        await session.commit()
+        return obj
+
+    async def update_many(
+        self, session: AsyncSession, objs_in: Mapping[Any, UpdateSchemaType]
+    ) -> Sequence[ModelType]:
+        """
+        Apply partial updates keyed by primary key in one transaction.
+
+        Updates setting the same fields share one UPDATE ... FROM (VALUES ...)
+        RETURNING statement. Ids that don't exist are absent from the result.
+        """
+        table = self.model.__table__
+        groups: dict[tuple[str, ...], list[tuple[Any, ...]]] = {}
+        for id, obj_in in objs_in.items():
+            update_data = obj_in.model_dump(exclude_unset=True)
+            fields = tuple(sorted(update_data))
+            groups.setdefault(fields, []).append(
+                (id, *(update_data[field] for field in fields))
+            )
+
+        updated: list[ModelType] = []
+        for fields, rows in groups.items():
+            if not fields:
+                ids = [row[0] for row in rows]
+                result = await session.scalars(
+                    select(self.model).where(table.c.id.in_(ids))
+                )
+                updated.extend(result.all())
+                continue
+            data = values(
+                *(column(name, table.c[name].type) for name in ("id", *fields)),
+                name="data",
+            ).data(rows)
+            stmt = (
+                update(self.model)
+                .where(table.c.id == data.c.id)
+                .values({field: data.c[field] for field in fields})
+                .returning(*table.c)
+            )
+            result = await session.scalars(
+                select(self.model)
+                .from_statement(stmt)
+                .execution_options(populate_existing=True)
+            )
+            updated.extend(result.all())
+        await session.commit()
+        return updated
+
 
 class CRUDBaseFull(
     CRUDCreateOnly[ModelType, CreateSchemaType],
@@ -66,8 +342,33 @@ class CRUDBaseFull(
         super().__init__(model)
 
     async def remove(self, session: AsyncSession, id: Any) -> ModelType | None:
-        obj = await self.get(session, id)
+        """
+        DELETE ... RETURNING in a single statement; returns the deleted row,
+        or ``None`` when no row has this id.
+        """
+        table = self.model.__table__
+        stmt = delete(self.model).where(table.c.id == id).returning(*table.c)
+        result = await session.scalars(
+            select(self.model)
+            .from_statement(stmt)
+            .execution_options(populate_existing=True)
+        )
+        obj: ModelType | None = result.first()
+        await session.commit()
         if obj:
-            await session.delete(obj)
-            await session.commit()
+            session.expunge(obj)
+            self.invalidate_count()
         return obj
+
+    async def remove_many(self, session: AsyncSession, ids: Sequence[Any]) -> list[Any]:
+        """Delete rows by primary key, returning the ids that existed."""
+        if not ids:
+            return []
+        table = self.model.__table__
+        result = await session.scalars(
+            delete(self.model).where(table.c.id.in_(ids)).returning(table.c.id)
+        )
+        removed = list(result.all())
+        await session.commit()
+        self.invalidate_count()
+        return removed
@@ -1,12 +1,22 @@
+import uuid
 from collections.abc import Sequence
+from typing import Any
 
-from sqlalchemy import select
+from sqlalchemy import REAL, and_, cast, func, literal, or_, select
+from sqlalchemy.dialects.postgresql import REGCONFIG
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.crud.base import CRUDBaseFull
+from app.crud.base import CRUDBaseFull, InvalidCursorError, decode_cursor, encode_cursor
 from app.models.item import Item
 from app.schemas.item import ItemCreate, ItemUpdate
 
+# Must match the configuration of the item.search_vector column
+SEARCH_CONFIG = "simple"
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
 
 class CRUDItem(CRUDBaseFull[Item, ItemCreate, ItemUpdate]):
     async def get_by_title(self, session: AsyncSession, title: str) -> Sequence[Item]:
@@ -16,5 +26,63 @@ class CRUDItem(CRUDBaseFull[Item, ItemCreate, ItemUpdate]):
         result = await session.execute(stmt)
         return result.scalars().all()
 
+    async def search(
+        self,
+        session: AsyncSession,
+        query: str,
+        *,
+        limit: int = 100,
+        cursor: str | None = None,
+    ) -> tuple[Sequence[Item], str | None]:
+        """
+        Full-text search on title and description plus prefix and fuzzy
+        (trigram) matches on the title, best matches first.
+
+        Keyset-paginated on (rank, id); a cursor is only valid for the
+        query that produced it.
+        """
+        if limit <= 0:
+            return [], None
+        table = self.model.__table__
+        tsquery = func.websearch_to_tsquery(literal(SEARCH_CONFIG, REGCONFIG), query)
+        rank = func.greatest(
+            func.ts_rank(table.c.search_vector, tsquery),
+            func.similarity(table.c.title, query),
+        )
+        stmt = (
+            select(self.model, rank)
+            .where(
+                or_(
+                    table.c.search_vector.bool_op("@@")(tsquery),
+                    table.c.title.ilike(f"{_escape_like(query)}%", escape="\\"),
+                    table.c.title.bool_op("%")(query),
+                )
+            )
+            .order_by(rank.desc(), table.c.id)
+            .limit(limit + 1)
+        )
+        if cursor:
+            value, after_id = self._parse_search_cursor(cursor)
+            # ranks are REAL: compared as double precision, the value read
+            # back from the cursor would never equal the row's rank
+            after_rank = cast(value, REAL)
+            stmt = stmt.where(
+                or_(rank < after_rank, and_(rank == after_rank, table.c.id > after_id))
+            )
+        rows = (await session.execute(stmt)).all()
+        items = [row[0] for row in rows[:limit]]
+        if len(rows) <= limit:
+            return items, None
+        last_item, last_rank = rows[limit - 1]
+        return items, encode_cursor([last_rank, last_item.id])
+
+    @staticmethod
+    def _parse_search_cursor(cursor: str) -> tuple[float, uuid.UUID]:
+        values: list[Any] = decode_cursor(cursor, 2)
+        try:
+            return float(values[0]), uuid.UUID(values[1])
+        except (TypeError, ValueError, AttributeError):
+            raise InvalidCursorError(cursor)
+
 
 item_crud = CRUDItem(Item)
@@ -1,11 +1,25 @@
+import uuid
+from typing import Any
+
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.security import get_password_hash, verify_password
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.security import password_hasher
 from app.crud.base import CRUDBaseFull
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
 
+# user id -> token version, ``None`` for deleted users. Per worker: a
+# revocation reaches the other workers once their entry expires.
+token_version_cache: TTLCache[uuid.UUID, int | None] = TTLCache(
+    maxsize=settings.TOKEN_VERSION_CACHE_MAX_SIZE,
+    ttl=settings.TOKEN_VERSION_CACHE_TTL_SECONDS,
+)
+
+_CACHE_MISS = object()
+
 
 class CRUDUser(CRUDBaseFull[User, UserCreate, UserUpdate]):
     async def get_by_email(self, db: AsyncSession, email: str) -> User | None:
@@ -19,35 +33,65 @@ class CRUDUser(CRUDBaseFull[User, UserCreate, UserUpdate]):
             full_name=obj_in.full_name,
             is_active=obj_in.is_active,
             is_superuser=obj_in.is_superuser,
-            hashed_password=get_password_hash(obj_in.password),
+            hashed_password=await password_hasher.hash(obj_in.password),
         )
         db.add(db_obj)
         await db.commit()
         await db.refresh(db_obj)
+        self.invalidate_count()
         return db_obj
 
     async def update(self, db: AsyncSession, db_obj: User, obj_in: UserUpdate) -> User:
         update_data = obj_in.model_dump(exclude_unset=True)
 
         if "password" in update_data:
-            update_data["hashed_password"] = get_password_hash(
+            update_data["hashed_password"] = await password_hasher.hash(
                 update_data.pop("password")
             )
 
         for field, value in update_data.items():
             setattr(db_obj, field, value)
+        # Claims embedded in stateless tokens are stale now
+        revoke = bool(
+            update_data.keys() & {"hashed_password", "is_active", "is_superuser"}
+        )
+        if revoke:
+            db_obj.token_version += 1
 
         await db.commit()
         await db.refresh(db_obj)
+        if revoke:
+            token_version_cache.invalidate(db_obj.id)
         return db_obj
 
+    async def remove(self, session: AsyncSession, id: Any) -> User | None:
+        obj = await super().remove(session, id)
+        token_version_cache.invalidate(id)
+        return obj
+
+    async def get_token_version(
+        self, db: AsyncSession, user_id: uuid.UUID
+    ) -> int | None:
+        """
+        Current token version of a user, ``None`` if the user doesn't exist.
+        Cached for TOKEN_VERSION_CACHE_TTL_SECONDS.
+        """
+        cached = token_version_cache.get(user_id, _CACHE_MISS)
+        if cached is None or isinstance(cached, int):
+            return cached
+        version = await db.scalar(
+            select(self.model.token_version).where(self.model.id == user_id)
+        )
+        token_version_cache.set(user_id, version)
+        return version
+
     async def authenticate(
         self, db: AsyncSession, email: str, password: str
     ) -> User | None:
         user = await self.get_by_email(db, email=email)
         if not user:
             return None
-        if not verify_password(password, user.hashed_password):
+        if not await password_hasher.verify(password, user.hashed_password):
             return None
         return user
 
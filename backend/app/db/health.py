@@ -0,0 +1,81 @@
+import asyncio
+import time
+from dataclasses import dataclass
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.db.session import engine
+
+
+async def ping(db_engine: AsyncEngine) -> None:
+    """Round trip to the database on a connection of the engine's pool."""
+    async with db_engine.connect() as conn:
+        await conn.execute(select(1))
+        # the rollback on checkin would deallocate the prepared statements
+        await conn.commit()
+
+
+@dataclass
+class ProbeResult:
+    ok: bool
+    latency_seconds: float
+    # monotonic time of the probe
+    checked_at: float
+    error: str | None = None
+
+
+class DatabaseProbe:
+    """
+    Pings the database at most once per ``ttl`` seconds and shares the
+    result, so frequent health checks don't each take a pool connection.
+    """
+
+    def __init__(self, db_engine: AsyncEngine, ttl: float, timeout: float) -> None:
+        self.db_engine = db_engine
+        self.ttl = ttl
+        self.timeout = timeout
+        self.last: ProbeResult | None = None
+        self._lock = asyncio.Lock()
+
+    async def check(self) -> ProbeResult:
+        if self._fresh():
+            assert self.last is not None
+            return self.last
+        async with self._lock:
+            # concurrent checks wait for a single probe
+            if not self._fresh():
+                self.last = await self._probe()
+            assert self.last is not None
+            return self.last
+
+    def _fresh(self) -> bool:
+        return (
+            self.last is not None and time.monotonic() - self.last.checked_at < self.ttl
+        )
+
+    async def _probe(self) -> ProbeResult:
+        started = time.monotonic()
+        error = None
+        try:
+            # an exhausted pool would otherwise wait DB_POOL_TIMEOUT
+            await asyncio.wait_for(ping(self.db_engine), self.timeout)
+        except asyncio.TimeoutError:
+            error = f"No response within {self.timeout}s"
+        except Exception as e:
+            # the endpoint is public, so no message (hosts, users...)
+            error = type(e).__name__
+        return ProbeResult(
+            ok=error is None,
+            latency_seconds=time.monotonic() - started,
+            checked_at=time.monotonic(),
+            error=error,
+        )
+
+
+database_probe = DatabaseProbe(
+    engine,
+    ttl=settings.HEALTH_CHECK_CACHE_SECONDS,
+    timeout=settings.HEALTH_CHECK_TIMEOUT_SECONDS,
+)
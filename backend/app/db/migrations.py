@@ -0,0 +1,158 @@
+"""
+Helpers for migrations on large tables, called from revision scripts::
+
+    from app.db.migrations import batched_update, create_index_concurrently
+
+They run outside the migration's transaction (in an autocommit block), so
+no lock is held for longer than one statement: indexes are built without
+blocking writes and data migrations commit batch by batch.
+"""
+
+import logging
+import time
+from collections.abc import Callable, Sequence
+from typing import Any
+
+from alembic import op
+from sqlalchemy import Connection, text
+
+# under alembic's logger, which alembic.ini sets to INFO
+logger = logging.getLogger("alembic.progress")
+
+
+class ProgressReporter:
+    """
+    Logs how far a data migration got, at most every ``interval`` seconds
+    and once more when it finishes.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        total: int | None = None,
+        interval: float = 5.0,
+        log: Callable[[str], None] = logger.info,
+    ) -> None:
+        self.name = name
+        self.total = total
+        self.interval = interval
+        self.log = log
+        self.done = 0
+        self.started = time.monotonic()
+        self._logged_at = self.started
+
+    def update(self, rows: int) -> None:
+        self.done += rows
+        now = time.monotonic()
+        if now - self._logged_at >= self.interval:
+            self._logged_at = now
+            self.log(self._message(now))
+
+    def finish(self) -> None:
+        self.log(self._message(time.monotonic()) + ", done")
+
+    def _message(self, now: float) -> str:
+        elapsed = now - self.started
+        rate = self.done / elapsed if elapsed else 0.0
+        message = f"{self.name}: {self.done}"
+        if self.total:
+            message += f"/{self.total} rows ({self.done / self.total:.0%})"
+        else:
+            message += " rows"
+        return f"{message} in {elapsed:.1f}s, {rate:.0f} rows/s"
+
+
+def _drop_invalid_index(bind: Connection, index_name: str) -> None:
+    # a failed or interrupted CREATE INDEX CONCURRENTLY leaves an invalid
+    # index behind, which IF NOT EXISTS would then keep
+    invalid = bind.scalar(
+        text(
+            "SELECT NOT indisvalid FROM pg_index WHERE indexrelid = to_regclass(:name)"
+        ),
+        {"name": bind.dialect.identifier_preparer.quote(index_name)},
+    )
+    if invalid:
+        logger.info("Dropping invalid index %s", index_name)
+        op.drop_index(index_name, postgresql_concurrently=True)
+
+
+def create_index_concurrently(
+    index_name: str, table_name: str, columns: Sequence[str], **kw: Any
+) -> None:
+    """
+    Build an index without blocking writes to the table.
+
+    Commits the migration's work so far. Safe to re-run after a failure:
+    an invalid leftover index is rebuilt, a valid one is kept.
+    """
+    with op.get_context().autocommit_block():
+        _drop_invalid_index(op.get_bind(), index_name)
+        op.create_index(
+            index_name,
+            table_name,
+            list(columns),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+            **kw,
+        )
+
+
+def drop_index_concurrently(index_name: str, table_name: str) -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            index_name,
+            table_name=table_name,
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def batched_update(
+    table_name: str,
+    values: str,
+    where: str = "true",
+    *,
+    batch_size: int = 5000,
+    pause: float = 0.0,
+    params: dict[str, Any] | None = None,
+    progress: ProgressReporter | None = None,
+) -> int:
+    """
+    ``UPDATE table_name SET values WHERE where`` in batches of
+    ``batch_size`` rows taken in primary key (``id``) order, each batch
+    committed on its own; returns the number of rows updated.
+
+    ``values`` and ``where`` are SQL fragments, with ``params`` bound in
+    them. Rows are locked for one batch only and ``pause`` seconds between
+    batches let replicas and autovacuum keep up. A rerun after a failure
+    starts over, so ``where`` should skip rows already migrated.
+    """
+    bind = op.get_bind()
+    table = bind.dialect.identifier_preparer.quote(table_name)
+    if progress is None:
+        total = bind.scalar(text(f"SELECT count(*) FROM {table} WHERE {where}"), params)
+        progress = ProgressReporter(f"UPDATE {table_name}", total)
+
+    after: Any = None
+    with op.get_context().autocommit_block():
+        while True:
+            # nothing sorts before the first id, whatever its type
+            keyset = "" if after is None else "id > :after AND "
+            ids = bind.scalars(
+                text(
+                    f"WITH batch AS ("
+                    f" SELECT id FROM {table} WHERE {keyset}({where})"
+                    f" ORDER BY id LIMIT :batch_size FOR UPDATE"
+                    f") UPDATE {table} SET {values} FROM batch"
+                    f" WHERE {table}.id = batch.id RETURNING {table}.id"
+                ),
+                {**(params or {}), "batch_size": batch_size, "after": after},
+            ).all()
+            if not ids:
+                break
+            after = max(ids)
+            progress.update(len(ids))
+            if pause:
+                time.sleep(pause)
+    progress.finish()
+    return progress.done
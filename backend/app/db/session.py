@@ -1,10 +1,273 @@
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+import itertools
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any
+
+from sqlalchemy import Connection, Delete, Engine, Insert, Update, event
+from sqlalchemy.engine import ExceptionContext
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry
 
 from app.core.config import settings
+from app.core.metrics import metrics
+from app.schemas.utils import PoolStatsPublic
+
+
+class PoolStats:
+    def __init__(self) -> None:
+        self.wait_seconds = metrics.histogram(
+            "db_pool_wait_seconds", "Time spent waiting for a pool connection"
+        ).labels()
+        self.timeouts = 0
+
+
+pool_stats = PoolStats()
+metrics.counter(
+    "db_pool_timeouts_total",
+    "Pool checkouts that timed out",
+    callback=lambda: pool_stats.timeouts,
+)
 
-engine = create_async_engine(
-    str(settings.SQLALCHEMY_DATABASE_URI), pool_pre_ping=True, echo=False
+
+class QueryStats:
+    """SQL statements executed while serving one request."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.seconds = 0.0
+        self.slowest_seconds = 0.0
+        self.slowest_statement: str | None = None
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.seconds += seconds
+        if seconds >= self.slowest_seconds:
+            self.slowest_seconds = seconds
+            self.slowest_statement = statement
+
+
+# stats of the request being served, set by QueryStatsMiddleware
+current_query_stats: ContextVar[QueryStats | None] = ContextVar(
+    "current_query_stats", default=None
 )
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long checkouts wait for a connection."""
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            pool_stats.timeouts += 1
+            raise
+        finally:
+            pool_stats.wait_seconds.observe(time.perf_counter() - start)
+
+
+def _create_engine(url: Any) -> AsyncEngine:
+    db_engine = create_async_engine(
+        str(url),
+        poolclass=InstrumentedAsyncPool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args={"prepare_threshold": settings.DB_PREPARE_THRESHOLD},
+        echo=False,
+    )
+    event.listen(db_engine.sync_engine, "connect", _configure_connection)
+    event.listen(db_engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(db_engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+    return db_engine
+
+
+def _configure_connection(
+    dbapi_connection: Any, _connection_record: ConnectionPoolEntry
+) -> None:
+    dbapi_connection.driver_connection.prepared_max = settings.DB_PREPARED_MAX
+
+
+def _before_cursor_execute(conn: Connection, *_args: Any) -> None:
+    if current_query_stats.get() is not None:
+        conn.info["query_started_at"] = time.perf_counter()
+
+
+def _after_cursor_execute(
+    conn: Connection, _cursor: Any, statement: str, *_args: Any
+) -> None:
+    stats = current_query_stats.get()
+    started_at = conn.info.pop("query_started_at", None)
+    if stats is not None and started_at is not None:
+        stats.record(statement, time.perf_counter() - started_at)
+
+
+class ReplicaRouter:
+    """
+    Picks a read replica per session, skipping replicas that recently
+    failed to connect.
+    """
+
+    def __init__(self, engines: list[AsyncEngine]) -> None:
+        self.engines = engines
+        self._counter = itertools.count()
+        self._failed_until: dict[AsyncEngine, float] = {}
+        for replica in engines:
+            event.listen(replica.sync_engine, "handle_error", self._on_error)
+
+    def choose(self) -> AsyncEngine | None:
+        now = time.monotonic()
+        healthy = [
+            replica
+            for replica in self.engines
+            if self._failed_until.get(replica, 0) <= now
+        ]
+        if not healthy:
+            return None
+        if settings.DB_REPLICA_SELECTION == "least_connections":
+            return min(healthy, key=lambda replica: replica.pool.checkedout())  # type: ignore[attr-defined]
+        return healthy[next(self._counter) % len(healthy)]
+
+    def mark_failed(self, replica: AsyncEngine) -> None:
+        self._failed_until[replica] = (
+            time.monotonic() + settings.DB_REPLICA_RETRY_SECONDS
+        )
+
+    def _on_error(self, context: ExceptionContext) -> None:
+        if context.is_disconnect or context.connection is None:
+            for replica in self.engines:
+                if replica.sync_engine is context.engine:
+                    self.mark_failed(replica)
+
+
+engine = _create_engine(settings.SQLALCHEMY_DATABASE_URI)
 AsyncSessionLocal = async_sessionmaker(
     bind=engine, expire_on_commit=False, class_=AsyncSession
 )
+
+metrics.gauge(
+    "db_pool_size",
+    "Connections the pool keeps open",
+    callback=lambda: engine.pool.size(),  # type: ignore[attr-defined]
+)
+metrics.gauge(
+    "db_pool_checked_out",
+    "Connections in use",
+    callback=lambda: engine.pool.checkedout(),  # type: ignore[attr-defined]
+)
+metrics.gauge(
+    "db_pool_overflow",
+    "Connections opened above the pool size",
+    callback=lambda: max(0, engine.pool.overflow()),  # type: ignore[attr-defined]
+)
+
+replica_router = ReplicaRouter(
+    [_create_engine(uri) for uri in settings.SQLALCHEMY_REPLICA_URIS]
+)
+
+
+class RoutingSession(Session):
+    """
+    Sends reads to one replica per session and writes to the primary.
+
+    Once the session has written, later reads go to the primary as well,
+    so a request always sees its own writes.
+    """
+
+    def get_bind(self, mapper: Any = None, clause: Any = None, **kw: Any) -> Engine:
+        if (
+            self._flushing
+            or isinstance(clause, Insert | Update | Delete)
+            or self.info.get("has_writes")
+        ):
+            self.info["has_writes"] = True
+            return engine.sync_engine
+        replica = self.info.get("replica")
+        if replica is None:
+            replica = replica_router.choose() or engine
+            self.info["replica"] = replica
+        return replica.sync_engine
+
+
+AsyncReadSessionLocal = async_sessionmaker(
+    bind=engine,
+    expire_on_commit=False,
+    class_=AsyncSession,
+    sync_session_class=RoutingSession,
+)
+
+
+async def connect_read_session(session: AsyncSession) -> bool:
+    """
+    Open the replica connection of a read session up front; returns False
+    (and takes the replica out of rotation) when it is unreachable.
+    """
+    if not replica_router.engines:
+        return True
+    try:
+        await session.connection()
+    except OperationalError:
+        replica = session.info.get("replica")
+        if replica is None or replica is engine:
+            raise
+        replica_router.mark_failed(replica)
+        return False
+    return True
+
+
+@asynccontextmanager
+async def read_session() -> AsyncIterator[AsyncSession]:
+    """
+    Session on a read replica when configured, falling back to the primary
+    when the chosen replica is unreachable.
+
+    The transaction ends with COMMIT rather than ROLLBACK: the same for a
+    read-only transaction, but psycopg deallocates every prepared statement
+    of the connection on ROLLBACK.
+    """
+    async with AsyncReadSessionLocal() as session:
+        if await connect_read_session(session):
+            yield session
+            await session.commit()
+            return
+    async with AsyncSessionLocal() as session:
+        yield session
+        await session.commit()
+
+
+async def dispose_engines() -> None:
+    """Close the pooled connections of the primary and replica engines."""
+    for db_engine in (engine, *replica_router.engines):
+        await db_engine.dispose()
+
+
+def get_pool_stats() -> PoolStatsPublic:
+    pool = engine.pool
+    assert isinstance(pool, InstrumentedAsyncPool)
+    wait = pool_stats.wait_seconds
+    return PoolStatsPublic(
+        size=pool.size(),
+        checked_in=pool.checkedin(),
+        checked_out=pool.checkedout(),
+        overflow=pool.overflow(),
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        timeouts=pool_stats.timeouts,
+        wait_count=wait.count,
+        wait_seconds_sum=wait.sum,
+        wait_seconds_buckets={
+            "+Inf" if bound == float("inf") else str(bound): count
+            for bound, count in wait.cumulative()
+        },
+    )
@@ -0,0 +1,115 @@
+import asyncio
+import logging
+import uuid
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, AsyncSession
+
+from app.core.config import settings
+from app.crud.api_key import api_crud, cache_api_key
+from app.crud.item import item_crud
+from app.crud.user import user_crud
+from app.db.session import AsyncSessionLocal, engine, replica_router
+
+logger = logging.getLogger(__name__)
+
+# Statements run by most requests: API key and user lookups, item and user
+# listings. Unknown keys and ids still produce the same SQL.
+HOT_QUERIES: list[Callable[[AsyncSession], Awaitable[Any]]] = [
+    lambda session: api_crud.get(session, ""),
+    lambda session: user_crud.get(session, uuid.UUID(int=0)),
+    lambda session: user_crud.get_page(session),
+    lambda session: item_crud.get(session, uuid.UUID(int=0)),
+    lambda session: item_crud.get_page(session),
+]
+# Listing counts, primed only when estimated: the other strategies run a
+# full count(*), too slow to repeat at startup
+COUNT_QUERIES: list[Callable[[AsyncSession], Awaitable[Any]]] = [
+    lambda session: user_crud.count(session, strategy="estimated"),
+    lambda session: item_crud.count(session, strategy="estimated"),
+]
+
+
+def _hot_queries() -> list[Callable[[AsyncSession], Awaitable[Any]]]:
+    if settings.LIST_COUNT_STRATEGY == "estimated":
+        return HOT_QUERIES + COUNT_QUERIES
+    return HOT_QUERIES
+
+
+async def _prime(conn: AsyncConnection) -> None:
+    # psycopg prepares a statement on the execution after DB_PREPARE_THRESHOLD
+    threshold = settings.DB_PREPARE_THRESHOLD
+    repeat = 1 if threshold is None else threshold + 1
+    queries = _hot_queries()
+    async with AsyncSession(bind=conn) as session:
+        for _ in range(repeat):
+            for query in queries:
+                await query(session)
+        # a ROLLBACK would deallocate the prepared statements
+        await session.commit()
+
+
+async def warm_up_engine(db_engine: AsyncEngine, connections: int) -> None:
+    """
+    Open ``connections`` pool connections at once and run the hot queries
+    on each, so they are checked back in already connected and with their
+    statements prepared.
+    """
+    conns = [db_engine.connect() for _ in range(connections)]
+    results = await asyncio.gather(
+        *(conn.start() for conn in conns), return_exceptions=True
+    )
+    opened = [
+        conn
+        for conn, result in zip(conns, results, strict=True)
+        if not isinstance(result, BaseException)
+    ]
+    try:
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        await asyncio.gather(*(_prime(conn) for conn in opened))
+    finally:
+        await asyncio.gather(*(conn.close() for conn in opened))
+
+
+async def warm_up_caches() -> None:
+    """Load the most recently used API keys into the API key cache."""
+    async with AsyncSessionLocal() as session:
+        keys = await api_crud.get_recently_used(
+            session, limit=settings.API_KEY_CACHE_WARMUP_SIZE
+        )
+        # end with COMMIT, as a ROLLBACK on checkin drops prepared statements
+        await session.commit()
+    for key_obj in keys:
+        cache_api_key(key_obj)
+
+
+async def warm_up() -> None:
+    """
+    Warm the primary and replica pools and the in-process caches before
+    serving. Best effort: failures are logged and startup goes on, with
+    connections opened lazily as before.
+    """
+    # overflow connections are closed on checkin, only the pool keeps them
+    connections = min(settings.DB_WARMUP_CONNECTIONS, settings.DB_POOL_SIZE)
+    if connections <= 0:
+        return
+    for db_engine in (engine, *replica_router.engines):
+        try:
+            await asyncio.wait_for(
+                warm_up_engine(db_engine, connections),
+                timeout=settings.DB_WARMUP_TIMEOUT_SECONDS,
+            )
+        except (DBAPIError, OSError, asyncio.TimeoutError):
+            logger.warning(
+                "Could not warm up connections to %s",
+                db_engine.url.render_as_string(),
+                exc_info=True,
+            )
+    try:
+        await warm_up_caches()
+    except DBAPIError:
+        logger.warning("Could not warm up the API key cache", exc_info=True)
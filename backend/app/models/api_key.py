@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import Boolean, DateTime, String
+from sqlalchemy import BigInteger, Boolean, DateTime, Integer, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
@@ -11,6 +11,19 @@ class APIKey(BaseModelMixin, Base):
     __tablename__ = "api_keys"
 
     name: Mapped[str] = mapped_column(String, nullable=False)
-    key: Mapped[str] = mapped_column(String, unique=True, index=True, nullable=False)
+    # HMAC-SHA256 of the key, see security.hash_api_key
+    key_hash: Mapped[str] = mapped_column(
+        String(64), unique=True, index=True, nullable=False
+    )
+    key_prefix: Mapped[str] = mapped_column(String(16), nullable=False)
     expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=True)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
+    # Requests per minute; NULL uses RATE_LIMIT_API_KEY_PER_MINUTE, 0 is
+    # unlimited
+    rate_limit: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    # Written in batches by APIKeyUsageTracker, so they lag behind by up to
+    # API_KEY_USAGE_FLUSH_INTERVAL_SECONDS
+    last_used_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    request_count: Mapped[int] = mapped_column(
+        BigInteger, default=0, server_default="0", nullable=False
+    )
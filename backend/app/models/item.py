@@ -1,4 +1,5 @@
-from sqlalchemy import String
+from sqlalchemy import Computed, Index, String
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
@@ -7,9 +8,29 @@ from app.db.mixins import BaseModelMixin
 
 class Item(Base, BaseModelMixin):
     __tablename__ = "item"
+    __table_args__ = (
+        Index("ix_item_date_created_id", "date_created", "id"),
+        Index("ix_item_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_item_title_trgm",
+            "title",
+            postgresql_using="gin",
+            postgresql_ops={"title": "gin_trgm_ops"},
+        ),
+    )
 
     title: Mapped[str] = mapped_column(String(255), nullable=False)
     description: Mapped[str] = mapped_column(String(255), nullable=True)
+    # Maintained by Postgres; deferred so regular reads don't fetch it
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(
+            "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('simple', coalesce(description, '')), 'B')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
 
     def __repr__(self) -> str:
         return f"<Item(id={self.id}, title={self.title})>"
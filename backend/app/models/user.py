@@ -1,4 +1,4 @@
-from sqlalchemy import String
+from sqlalchemy import Index, String
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
@@ -7,6 +7,7 @@ from app.db.mixins import BaseModelMixin
 
 class User(BaseModelMixin, Base):
     __tablename__ = "user"
+    __table_args__ = (Index("ix_user_date_created_id", "date_created", "id"),)
 
     email: Mapped[str] = mapped_column(
         String(255), unique=True, index=True, nullable=False
@@ -15,3 +16,5 @@ class User(BaseModelMixin, Base):
     full_name: Mapped[str | None] = mapped_column(String(255), nullable=True)
     is_active: Mapped[bool] = mapped_column(default=True)
     is_superuser: Mapped[bool] = mapped_column(default=False)
+    # Bumped to revoke the stateless access tokens issued before
+    token_version: Mapped[int] = mapped_column(default=0, server_default="0")
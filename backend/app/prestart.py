@@ -0,0 +1,106 @@
+"""
+Prepare the database before the app starts, in one process: wait until it
+answers, apply the migrations and create the initial data.
+
+Migrations and seeding run under a Postgres advisory lock, so containers
+starting together run them one after the other; the later ones find the
+schema at head and the data in place.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import Connection, func, select
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.backend_pre_start import init as wait_for_database
+from app.db.init_db import init_db
+from app.db.session import AsyncSessionLocal, engine
+
+logging.basicConfig(level=logging.INFO)
+# as in alembic.ini
+logging.getLogger("sqlalchemy").setLevel(logging.WARNING)
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+# Arbitrary key identifying the prestart lock among advisory locks
+MIGRATION_LOCK_ID = 7_265_411_002
+MIGRATION_LOCK_POLL_SECONDS = 0.5
+
+
+def alembic_config(connection: Connection) -> Config:
+    config = Config(str(BACKEND_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(BACKEND_DIR / "app" / "alembic"))
+    config.attributes["connection"] = connection
+    config.attributes["configure_logger"] = False
+    return config
+
+
+def _upgrade(connection: Connection, revision: str) -> None:
+    command.upgrade(alembic_config(connection), revision)
+
+
+@asynccontextmanager
+async def migration_lock(db_engine: AsyncEngine) -> AsyncIterator[AsyncConnection]:
+    """
+    Hold the session-level advisory lock on a dedicated connection, waiting
+    while another process holds it.
+
+    The lock is polled rather than waited for: a transaction blocked in
+    pg_advisory_lock would keep its snapshot, and CREATE INDEX CONCURRENTLY
+    in the holder's migrations waits for all older snapshots (a deadlock).
+    """
+    async with db_engine.connect() as conn:
+        while True:
+            locked = await conn.scalar(
+                select(func.pg_try_advisory_lock(MIGRATION_LOCK_ID))
+            )
+            # the lock outlives transactions; alembic opens its own
+            await conn.commit()
+            if locked:
+                break
+            await asyncio.sleep(MIGRATION_LOCK_POLL_SECONDS)
+        try:
+            yield conn
+        finally:
+            await conn.execute(select(func.pg_advisory_unlock(MIGRATION_LOCK_ID)))
+            await conn.commit()
+
+
+async def run_migrations(conn: AsyncConnection, revision: str = "head") -> None:
+    await conn.run_sync(_upgrade, revision)
+
+
+async def prestart(db_engine: AsyncEngine) -> None:
+    started = time.monotonic()
+    await wait_for_database(db_engine)
+    logger.info("Database ready after %.1fs", time.monotonic() - started)
+
+    async with migration_lock(db_engine) as conn:
+        step = time.monotonic()
+        await run_migrations(conn)
+        logger.info("Migrations applied in %.1fs", time.monotonic() - step)
+
+        step = time.monotonic()
+        async with AsyncSessionLocal() as session:
+            await init_db(session)
+        logger.info("Initial data created in %.1fs", time.monotonic() - step)
+
+    logger.info("Prestart finished in %.1fs", time.monotonic() - started)
+
+
+async def main() -> None:
+    try:
+        await prestart(engine)
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,12 +1,14 @@
 import uuid
 from datetime import datetime
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class APIKeyBase(BaseModel):
     name: str
     expires_at: datetime | None = None
+    # запросов в минуту; None - лимит по умолчанию, 0 - без лимита
+    rate_limit: int | None = Field(default=None, ge=0)
 
 
 class APIKeyCreate(APIKeyBase):
@@ -15,9 +17,16 @@ class APIKeyCreate(APIKeyBase):
 
 class APIKeyPublic(APIKeyBase):
     id: uuid.UUID
-    key: str
+    key_prefix: str
     is_active: bool
     date_created: datetime
+    last_used_at: datetime | None = None
+    request_count: int = 0
 
     class Config:
         from_attributes = True
+
+
+# Ответ при создании: сам ключ показывается только один раз
+class APIKeyCreated(APIKeyPublic):
+    key: str
@@ -1,3 +1,6 @@
+import uuid
+from typing import Any
+
 from pydantic import BaseModel
 
 
@@ -5,6 +8,19 @@ class Message(BaseModel):
     message: str
 
 
+# Ошибка для одного элемента batch-запроса
+class BatchItemError(BaseModel):
+    index: int
+    detail: Any
+
+
+# Итог импорта
+class ImportSummary(BaseModel):
+    accepted: int
+    rejected: int
+    errors: list[BatchItemError]
+
+
 # JSON payload containing access token
 class Token(BaseModel):
     access_token: str
@@ -14,3 +30,17 @@ class Token(BaseModel):
 # Contents of JWT token
 class TokenPayload(BaseModel):
     sub: str | None = None
+    # Only present in tokens issued with JWT_STATELESS_AUTH enabled
+    is_active: bool | None = None
+    is_superuser: bool | None = None
+    ver: int | None = None
+
+
+# Authenticated caller, built from the token alone in stateless mode
+class Principal(BaseModel):
+    id: uuid.UUID
+    is_active: bool
+    is_superuser: bool
+
+    class Config:
+        from_attributes = True
@@ -1,6 +1,8 @@
 import uuid
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, field_validator
+
+from app.schemas.common import BatchItemError
 
 
 # Базовые свойства
@@ -19,6 +21,14 @@ class ItemUpdate(BaseModel):
     title: str | None = Field(default=None, min_length=1, max_length=255)
     description: str | None = Field(default=None, max_length=255)
 
+    # title можно не передавать, но не null: в таблице он NOT NULL
+    @field_validator("title")
+    @classmethod
+    def title_not_null(cls, value: str | None) -> str:
+        if value is None:
+            raise ValueError("Title can't be null")
+        return value
+
 
 # Ответ через API
 class ItemPublic(ItemBase):
@@ -30,7 +40,27 @@ class ItemPublic(ItemBase):
 
 class ItemsPublic(BaseModel):
     data: list[ItemPublic]
-    count: int
+    count: int | None
+    next_cursor: str | None = None
 
     class Config:
         from_attributes = True
+
+
+# Batch-операции
+class ItemBatchUpdate(ItemUpdate):
+    id: uuid.UUID
+
+
+class ItemsBatchPublic(BaseModel):
+    data: list[ItemPublic]
+    errors: list[BatchItemError]
+
+
+class ItemsBatchDelete(BaseModel):
+    ids: list[uuid.UUID]
+
+
+class ItemsBatchDeletePublic(BaseModel):
+    deleted: list[uuid.UUID]
+    errors: list[BatchItemError]
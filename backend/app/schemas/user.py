@@ -52,10 +52,16 @@ class UserPublic(UserBase):
         from_attributes = True
 
 
+# Строка из БД: email уже проверен при записи, повторная проверка дорогая
+class UserRecord(UserPublic):
+    email: str
+
+
 # Ответ на список пользователей
 class UsersPublic(BaseModel):
     data: list[UserPublic]
-    count: int
+    count: int | None
+    next_cursor: str | None = None
 
     class Config:
         from_attributes = True
@@ -0,0 +1,49 @@
+from pydantic import BaseModel
+
+
+# Статистика пула соединений текущего воркера
+class PoolStatsPublic(BaseModel):
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    max_overflow: int
+    timeouts: int
+    wait_count: int
+    wait_seconds_sum: float
+    # cumulative checkouts per wait-time upper bound, in seconds
+    wait_seconds_buckets: dict[str, int]
+
+
+# Статистика SQL-запросов по маршруту текущего воркера
+class RouteQueryStatsPublic(BaseModel):
+    requests: int
+    queries: int
+    queries_per_request: float
+    max_queries: int
+    db_seconds: float
+    slowest_seconds: float
+    slowest_statement: str | None
+    # requests above DB_QUERY_COUNT_WARNING_THRESHOLD
+    threshold_exceeded: int
+
+
+# Готовность воркера принимать запросы
+class DatabaseHealthPublic(BaseModel):
+    ok: bool
+    latency_ms: float
+    # age of the cached probe result
+    checked_seconds_ago: float
+    error: str | None
+
+
+class PoolHealthPublic(BaseModel):
+    checked_out: int
+    # checked_out / (pool size + max overflow)
+    saturation: float
+
+
+class ReadinessPublic(BaseModel):
+    ready: bool
+    database: DatabaseHealthPublic
+    pool: PoolHealthPublic
@@ -1,6 +1,12 @@
+import uuid
+
 from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
+from app.core.security import hash_api_key
+from app.crud.api_key import api_key_usage
+from app.models.api_key import APIKey
 
 
 def test_create_api_key_success(
@@ -18,5 +24,130 @@ def test_create_api_key_success(
     assert response.status_code == 200, response.text
     data = response.json()
     assert "key" in data
+    assert data["key_prefix"] == data["key"][:8]
     assert data["name"] == data["name"]
     assert data["expires_at"] == data["expires_at"]
+
+
+async def test_api_key_stored_hashed(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    db: AsyncSession,
+) -> None:
+    r = client.post(
+        f"{settings.API_V1_STR}/api-keys/",
+        headers=superuser_token_headers,
+        json={"name": "hashed"},
+    )
+    created = r.json()
+    api_key = await db.get(APIKey, uuid.UUID(created["id"]))
+    assert api_key
+    assert api_key.key_hash == hash_api_key(created["key"])
+    assert created["key"] not in api_key.key_hash
+
+    r = client.get(
+        f"{settings.API_V1_STR}/items/", headers={"X-API-Key": created["key"]}
+    )
+    assert r.status_code == 200
+
+
+def test_deactivate_api_key(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+) -> None:
+    r = client.post(
+        f"{settings.API_V1_STR}/api-keys/",
+        headers=superuser_token_headers,
+        json={"name": "short-lived"},
+    )
+    api_key = r.json()
+    headers = {"X-API-Key": api_key["key"]}
+
+    # first call populates the lookup cache
+    r = client.get(f"{settings.API_V1_STR}/items/", headers=headers)
+    assert r.status_code == 200
+
+    r = client.delete(
+        f"{settings.API_V1_STR}/api-keys/{api_key['id']}",
+        headers=superuser_token_headers,
+    )
+    assert r.status_code == 200
+    assert r.json()["message"] == "API key deactivated successfully"
+
+    r = client.get(f"{settings.API_V1_STR}/items/", headers=headers)
+    assert r.status_code == 403
+    assert r.json()["detail"] == "Invalid API key"
+
+
+def test_deactivate_api_key_not_found(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+) -> None:
+    r = client.delete(
+        f"{settings.API_V1_STR}/api-keys/{uuid.uuid4()}",
+        headers=superuser_token_headers,
+    )
+    assert r.status_code == 404
+    assert r.json()["detail"] == "API key not found"
+
+
+def test_invalid_api_key(client: TestClient) -> None:
+    headers = {"X-API-Key": "does-not-exist"}
+    for _ in range(2):
+        r = client.get(f"{settings.API_V1_STR}/items/", headers=headers)
+        assert r.status_code == 403
+        assert r.json()["detail"] == "Invalid API key"
+
+
+async def test_api_key_usage_tracking(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    db: AsyncSession,
+) -> None:
+    r = client.post(
+        f"{settings.API_V1_STR}/api-keys/",
+        headers=superuser_token_headers,
+        json={"name": "tracked"},
+    )
+    created = r.json()
+    headers = {"X-API-Key": created["key"]}
+    for _ in range(3):
+        client.get(f"{settings.API_V1_STR}/items/", headers=headers)
+
+    api_key = await db.get(APIKey, uuid.UUID(created["id"]))
+    assert api_key
+    # nothing is written on the request path
+    assert api_key.request_count == 0
+    assert api_key.last_used_at is None
+    date_updated = api_key.date_updated
+
+    await api_key_usage.flush()
+    await db.refresh(api_key)
+    assert api_key.request_count == 3
+    assert api_key.last_used_at is not None
+    assert api_key.date_updated == date_updated
+
+
+def test_api_key_rate_limit(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+) -> None:
+    r = client.post(
+        f"{settings.API_V1_STR}/api-keys/",
+        headers=superuser_token_headers,
+        json={"name": "limited", "rate_limit": 2},
+    )
+    assert r.json()["rate_limit"] == 2
+    headers = {"X-API-Key": r.json()["key"]}
+
+    r = client.get(f"{settings.API_V1_STR}/items/", headers=headers)
+    assert r.status_code == 200
+    assert r.headers["x-ratelimit-limit"] == "2"
+    assert r.headers["x-ratelimit-remaining"] == "1"
+    client.get(f"{settings.API_V1_STR}/items/", headers=headers)
+
+    r = client.get(f"{settings.API_V1_STR}/items/", headers=headers)
+    assert r.status_code == 429
+    assert r.json()["detail"] == "Rate limit exceeded"
+    assert r.headers["x-ratelimit-remaining"] == "0"
+    assert int(r.headers["retry-after"]) > 0
@@ -1,9 +1,17 @@
+import csv
+import io
+import json
 import uuid
 
+import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.deps import MAX_PAGE_LIMIT
+from app.api.routes.items import item_cache
 from app.core.config import settings
+from app.core.response_cache import MemoryBackend
+from app.crud.item import item_crud
 from app.tests.utils.item import create_random_item
 
 
@@ -118,3 +126,301 @@ def test_delete_item_not_found(
     )
     assert response.status_code == 404
     assert response.json()["detail"] == "Item not found"
+
+
+async def test_read_items_cursor_pagination(
+    client: TestClient, api_key_header: dict[str, str], db: AsyncSession
+) -> None:
+    for _ in range(3):
+        await create_random_item(db)
+    seen: list[str] = []
+    cursor = None
+    while True:
+        params: dict[str, str | int] = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get(
+            f"{settings.API_V1_STR}/items/", headers=api_key_header, params=params
+        )
+        assert response.status_code == 200
+        content = response.json()
+        assert len(content["data"]) <= 2
+        seen.extend(item["id"] for item in content["data"])
+        cursor = content["next_cursor"]
+        if cursor is None:
+            break
+    assert len(seen) == content["count"]
+    assert len(set(seen)) == len(seen)
+
+
+def test_read_items_invalid_cursor(
+    client: TestClient, api_key_header: dict[str, str]
+) -> None:
+    response = client.get(
+        f"{settings.API_V1_STR}/items/",
+        headers=api_key_header,
+        params={"cursor": "not-a-cursor"},
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+
+
+@pytest.mark.parametrize("limit", [0, -1, MAX_PAGE_LIMIT + 1])
+def test_read_items_invalid_limit(
+    client: TestClient, api_key_header: dict[str, str], limit: int
+) -> None:
+    response = client.get(
+        f"{settings.API_V1_STR}/items/",
+        headers=api_key_header,
+        params={"limit": limit},
+    )
+    assert response.status_code == 422
+
+
+async def test_read_items_without_count(
+    client: TestClient, api_key_header: dict[str, str], db: AsyncSession
+) -> None:
+    await create_random_item(db)
+    response = client.get(
+        f"{settings.API_V1_STR}/items/",
+        headers=api_key_header,
+        params={"include_count": False},
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content["count"] is None
+    assert len(content["data"]) >= 1
+
+
+def test_create_items_batch(client: TestClient, api_key_header: dict[str, str]) -> None:
+    data = [
+        {"title": "First", "description": "one"},
+        {"description": "missing title"},
+        {"title": "Third"},
+    ]
+    response = client.post(
+        f"{settings.API_V1_STR}/items/batch", headers=api_key_header, json=data
+    )
+    assert response.status_code == 200, response.text
+    content = response.json()
+    assert [item["title"] for item in content["data"]] == ["First", "Third"]
+    assert len(content["errors"]) == 1
+    assert content["errors"][0]["index"] == 1
+
+
+async def test_update_items_batch(
+    client: TestClient, api_key_header: dict[str, str], db: AsyncSession
+) -> None:
+    item_1 = await create_random_item(db)
+    item_2 = await create_random_item(db)
+    data = [
+        {"id": str(item_1.id), "title": "Updated 1"},
+        {"id": str(item_2.id), "description": "Updated 2"},
+        {"id": str(uuid.uuid4()), "title": "Missing"},
+        {"id": str(item_1.id), "title": "Duplicate"},
+        {"id": str(item_2.id), "title": None},
+    ]
+    response = client.patch(
+        f"{settings.API_V1_STR}/items/batch", headers=api_key_header, json=data
+    )
+    assert response.status_code == 200, response.text
+    content = response.json()
+    updated = {item["id"]: item for item in content["data"]}
+    assert updated[str(item_1.id)]["title"] == "Updated 1"
+    assert updated[str(item_1.id)]["description"] == item_1.description
+    assert updated[str(item_2.id)]["title"] == item_2.title
+    assert updated[str(item_2.id)]["description"] == "Updated 2"
+    errors = {e["index"]: e["detail"] for e in content["errors"]}
+    assert errors.keys() == {2, 3, 4}
+    assert errors[2] == "Item not found"
+    assert errors[3] == "Duplicate item id"
+    assert "Title can't be null" in errors[4][0]["msg"]
+
+
+async def test_delete_items_batch(
+    client: TestClient, api_key_header: dict[str, str], db: AsyncSession
+) -> None:
+    item = await create_random_item(db)
+    missing_id = str(uuid.uuid4())
+    response = client.post(
+        f"{settings.API_V1_STR}/items/batch/delete",
+        headers=api_key_header,
+        json={"ids": [str(item.id), missing_id]},
+    )
+    assert response.status_code == 200, response.text
+    content = response.json()
+    assert content["deleted"] == [str(item.id)]
+    assert content["errors"] == [{"index": 1, "detail": "Item not found"}]
+
+
+def test_items_batch_too_large(
+    client: TestClient, api_key_header: dict[str, str]
+) -> None:
+    data = [{"title": "x"}] * (settings.BATCH_MAX_SIZE + 1)
+    response = client.post(
+        f"{settings.API_V1_STR}/items/batch", headers=api_key_header, json=data
+    )
+    assert response.status_code == 413
+
+
+async def test_read_item_etag(
+    client: TestClient, api_key_header: dict[str, str], db: AsyncSession
+) -> None:
+    item = await create_random_item(db)
+    url = f"{settings.API_V1_STR}/items/{item.id}"
+    response = client.get(url, headers=api_key_header)
+    assert response.status_code == 200
+    etag = response.headers["etag"]
+
+    response = client.get(url, headers={**api_key_header, "If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert response.content == b""
+
+    client.put(url, headers=api_key_header, json={"title": "Updated"})
+    response = client.get(url, headers={**api_key_header, "If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert response.json()["title"] == "Updated"
+
+
+async def test_read_items_response_cache(
+    client: TestClient,
+    api_key_header: dict[str, str],
+    db: AsyncSession,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(item_cache, "backend", MemoryBackend(maxsize=10, ttl=30))
+    item = await create_random_item(db)
+    url = f"{settings.API_V1_STR}/items/"
+    first = client.get(url, headers=api_key_header)
+    assert first.status_code == 200
+
+    # served from the cache: the direct DB write is not seen
+    await create_random_item(db)
+    cached = client.get(url, headers=api_key_header)
+    assert cached.json() == first.json()
+    assert cached.headers["etag"] == first.headers["etag"]
+
+    # writes through the API invalidate the cache
+    client.put(
+        f"{settings.API_V1_STR}/items/{item.id}",
+        headers=api_key_header,
+        json={"title": "Updated"},
+    )
+    fresh = client.get(url, headers=api_key_header)
+    assert fresh.json()["count"] == first.json()["count"] + 1
+    assert fresh.headers["etag"] != first.headers["etag"]
+
+
+async def test_search_items(
+    client: TestClient, api_key_header: dict[str, str], db: AsyncSession
+) -> None:
+    item = await create_random_item(db)
+    response = client.get(
+        f"{settings.API_V1_STR}/items/search",
+        headers=api_key_header,
+        params={"q": item.title},
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert [found["id"] for found in content["data"]] == [str(item.id)]
+    assert content["count"] is None
+    assert content["next_cursor"] is None
+
+
+def test_search_items_invalid(
+    client: TestClient, api_key_header: dict[str, str]
+) -> None:
+    url = f"{settings.API_V1_STR}/items/search"
+    response = client.get(url, headers=api_key_header, params={"q": ""})
+    assert response.status_code == 422
+    response = client.get(
+        url, headers=api_key_header, params={"q": "lamp", "cursor": "not-a-cursor"}
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor"
+    for limit in (0, -1, MAX_PAGE_LIMIT + 1):
+        response = client.get(
+            url, headers=api_key_header, params={"q": "lamp", "limit": limit}
+        )
+        assert response.status_code == 422
+
+
+async def test_export_items(
+    client: TestClient,
+    api_key_header: dict[str, str],
+    db: AsyncSession,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "EXPORT_BATCH_SIZE", 2)
+    items = [await create_random_item(db) for _ in range(5)]
+    url = f"{settings.API_V1_STR}/items/export"
+
+    response = client.get(url, headers=api_key_header)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["id"] for row in rows] == [str(item.id) for item in items]
+
+    response = client.get(url, headers=api_key_header, params={"format": "csv"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert 'filename="items.csv"' in response.headers["content-disposition"]
+    csv_rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["title"] for row in csv_rows] == [item.title for item in items]
+
+
+async def test_import_items_ndjson(
+    client: TestClient,
+    api_key_header: dict[str, str],
+    db: AsyncSession,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "IMPORT_BATCH_SIZE", 2)
+    title = f"import-{uuid.uuid4()}"
+    lines = [
+        json.dumps({"title": title, "description": "first"}),
+        "",
+        "{not json",
+        json.dumps({"title": title}),
+        json.dumps({"title": ""}),
+        json.dumps({"title": title, "description": "üñí"}),
+    ]
+    response = client.post(
+        f"{settings.API_V1_STR}/items/import",
+        headers={**api_key_header, "Content-Type": "application/x-ndjson"},
+        content="\n".join(lines).encode(),
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content["accepted"] == 3
+    assert content["rejected"] == 2
+    assert [error["index"] for error in content["errors"]] == [1, 3]
+    assert content["errors"][0]["detail"] == "Invalid JSON"
+    items = await item_crud.get_by_title(db, title)
+    assert sorted(item.description or "" for item in items) == ["", "first", "üñí"]
+
+
+async def test_import_items_csv(
+    client: TestClient, api_key_header: dict[str, str], db: AsyncSession
+) -> None:
+    title = f"import-{uuid.uuid4()}"
+    body = (
+        "title,description\r\n"
+        f'{title},"two\r\nlines"\r\n'
+        f"{title},\r\n"
+        "too,many,fields\r\n"
+    )
+    response = client.post(
+        f"{settings.API_V1_STR}/items/import",
+        headers={**api_key_header, "Content-Type": "text/csv"},
+        params={"format": "csv"},
+        content=body.encode(),
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert (content["accepted"], content["rejected"]) == (2, 1)
+    assert content["errors"][0]["index"] == 2
+    items = await item_crud.get_by_title(db, title)
+    assert sorted(item.description or "" for item in items) == ["", "two\r\nlines"]
@@ -1,6 +1,16 @@
+import uuid
+
+import jwt
+import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core import security
 from app.core.config import settings
+from app.crud.user import token_version_cache
+from app.models.user import User
+from app.tests.utils.utils import get_superuser_token_headers
 
 
 def test_get_access_token(client: TestClient) -> None:
@@ -34,3 +44,47 @@ def test_use_access_token(
     result = r.json()
     assert r.status_code == 200
     assert "email" in result
+
+
+async def test_stateless_access_token(
+    client: TestClient, db: AsyncSession, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(settings, "JWT_STATELESS_AUTH", True)
+    headers = get_superuser_token_headers(client)
+    token = headers["Authorization"].removeprefix("Bearer ")
+    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[security.ALGORITHM])
+    assert payload["is_active"] is True
+    assert payload["is_superuser"] is True
+    assert "ver" in payload
+
+    r = client.get(f"{settings.API_V1_STR}/users/", headers=headers)
+    assert r.status_code == 200
+
+    # revoked by another worker...
+    user_id = uuid.UUID(payload["sub"])
+    await db.execute(
+        update(User)
+        .where(User.id == user_id)
+        .values(token_version=User.token_version + 1)
+    )
+    await db.commit()
+    # ...and seen here once the cached version expires
+    token_version_cache.invalidate(user_id)
+    r = client.get(f"{settings.API_V1_STR}/users/", headers=headers)
+    assert r.status_code == 403
+    assert r.json()["detail"] == "Token has been revoked"
+
+    # a fresh login picks up the new token version
+    r = client.get(
+        f"{settings.API_V1_STR}/users/", headers=get_superuser_token_headers(client)
+    )
+    assert r.status_code == 200
+
+
+def test_invalid_access_token(client: TestClient) -> None:
+    r = client.post(
+        f"{settings.API_V1_STR}/login/test-token",
+        headers={"Authorization": "Bearer not-a-token"},
+    )
+    assert r.status_code == 403
+    assert r.json()["detail"] == "Could not validate credentials"
@@ -1,9 +1,12 @@
+import json
 import uuid
 
+import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.deps import MAX_PAGE_LIMIT
 from app.core.config import settings
 from app.core.security import verify_password
 from app.crud.user import user_crud
@@ -194,3 +197,72 @@ def test_delete_user_me_as_superuser(
     )
     assert r.status_code == 403
     assert r.json()["detail"] == "Superusers cannot delete themselves"
+
+
+@pytest.mark.parametrize("limit", [0, -5, MAX_PAGE_LIMIT + 1])
+def test_read_users_invalid_limit(
+    client: TestClient, superuser_token_headers: dict[str, str], limit: int
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/users/",
+        headers=superuser_token_headers,
+        params={"limit": limit},
+    )
+    assert r.status_code == 422
+
+
+async def test_read_users_cursor_pagination(
+    client: TestClient, superuser_token_headers: dict[str, str], db: AsyncSession
+) -> None:
+    for _ in range(2):
+        await user_crud.create(
+            db, UserCreate(email=random_email(), password=random_lower_string())
+        )
+    r = client.get(
+        f"{settings.API_V1_STR}/users/",
+        headers=superuser_token_headers,
+        params={"limit": 1},
+    )
+    assert r.status_code == 200
+    first_page = r.json()
+    assert len(first_page["data"]) == 1
+    assert first_page["next_cursor"]
+
+    r = client.get(
+        f"{settings.API_V1_STR}/users/",
+        headers=superuser_token_headers,
+        params={"limit": 1, "cursor": first_page["next_cursor"]},
+    )
+    assert r.status_code == 200
+    second_page = r.json()
+    assert len(second_page["data"]) == 1
+    assert second_page["data"][0]["id"] != first_page["data"][0]["id"]
+
+
+def test_user_rate_limit(
+    client: TestClient,
+    normal_user_token_headers: dict[str, str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr(settings, "RATE_LIMIT_USER_PER_MINUTE", 1)
+    r = client.get(f"{settings.API_V1_STR}/users/me", headers=normal_user_token_headers)
+    assert r.status_code == 200
+    assert r.headers["x-ratelimit-limit"] == "1"
+    r = client.get(f"{settings.API_V1_STR}/users/me", headers=normal_user_token_headers)
+    assert r.status_code == 429
+
+
+def test_export_users(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    normal_user_token_headers: dict[str, str],
+) -> None:
+    url = f"{settings.API_V1_STR}/users/export"
+    r = client.get(url, headers=superuser_token_headers)
+    assert r.status_code == 200
+    emails = [json.loads(line)["email"] for line in r.text.splitlines()]
+    assert settings.FIRST_SUPERUSER in emails
+    assert all("hashed_password" not in line for line in r.text.splitlines())
+
+    r = client.get(url, headers=normal_user_token_headers)
+    assert r.status_code == 403
@@ -0,0 +1,119 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.db import health
+from app.db.health import DatabaseProbe, database_probe
+from app.db.session import engine
+
+
+def test_health_check(client: TestClient) -> None:
+    r = client.get(f"{settings.API_V1_STR}/utils/health-check/")
+    assert r.status_code == 200
+    assert r.json() is True
+
+
+def test_pool_stats(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/utils/pool-stats/", headers=superuser_token_headers
+    )
+    assert r.status_code == 200
+    stats = r.json()
+    assert stats["size"] == settings.DB_POOL_SIZE
+    assert stats["checked_out"] >= 1
+    assert stats["wait_count"] >= 1
+    assert stats["wait_seconds_buckets"]["+Inf"] == stats["wait_count"]
+
+
+def test_pool_stats_requires_superuser(
+    client: TestClient, normal_user_token_headers: dict[str, str]
+) -> None:
+    r = client.get(
+        f"{settings.API_V1_STR}/utils/pool-stats/", headers=normal_user_token_headers
+    )
+    assert r.status_code == 403
+
+
+def test_metrics(client: TestClient, superuser_token_headers: dict[str, str]) -> None:
+    client.get(f"{settings.API_V1_STR}/users/me", headers=superuser_token_headers)
+    r = client.get(f"{settings.API_V1_STR}/utils/metrics/")
+    assert r.status_code == 200
+    assert r.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = r.text
+    assert (
+        'http_requests_total{method="GET",operation_id="users-read_user_me",status="200"}'
+        in text
+    )
+    assert (
+        'http_request_duration_seconds_count{operation_id="users-read_user_me"}' in text
+    )
+    assert "http_requests_in_flight 1" in text
+    assert f"db_pool_size {settings.DB_POOL_SIZE}" in text
+    assert "password_hash_queue_depth 0" in text
+
+
+def test_liveness(client: TestClient) -> None:
+    r = client.get(f"{settings.API_V1_STR}/utils/liveness/")
+    assert r.status_code == 200
+    assert r.json() is True
+
+
+def test_readiness(client: TestClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    url = f"{settings.API_V1_STR}/utils/readiness/"
+    monkeypatch.setattr(database_probe, "last", None)
+    r = client.get(url)
+    assert r.status_code == 200
+    content = r.json()
+    assert content["ready"] is True
+    assert content["database"]["ok"] is True
+    assert content["database"]["error"] is None
+    assert 0 <= content["pool"]["saturation"] < 1
+
+    # an exhausted pool makes the worker not ready
+    monkeypatch.setattr(settings, "HEALTH_CHECK_MAX_POOL_SATURATION", 0)
+    r = client.get(url)
+    assert r.status_code == 503
+    assert r.json()["ready"] is False
+    assert r.json()["database"]["ok"] is True
+
+
+async def test_database_probe_cached(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls = 0
+
+    async def fake_ping(_db_engine: AsyncEngine) -> None:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+
+    monkeypatch.setattr(health, "ping", fake_ping)
+    probe = DatabaseProbe(engine, ttl=60, timeout=1)
+    results = await asyncio.gather(*(probe.check() for _ in range(5)))
+    assert all(result.ok for result in results)
+    assert (await probe.check()).checked_at == results[0].checked_at
+    assert calls == 1
+
+    probe.ttl = 0
+    await probe.check()
+    assert calls == 2
+
+
+async def test_database_probe_failure(monkeypatch: pytest.MonkeyPatch) -> None:
+    async def hanging_ping(_db_engine: AsyncEngine) -> None:
+        await asyncio.sleep(10)
+
+    monkeypatch.setattr(health, "ping", hanging_ping)
+    result = await DatabaseProbe(engine, ttl=0, timeout=0.01).check()
+    assert not result.ok
+    assert result.error == "No response within 0.01s"
+
+    async def failing_ping(_db_engine: AsyncEngine) -> None:
+        raise OSError("connection refused by db.internal")
+
+    monkeypatch.setattr(health, "ping", failing_ping)
+    result = await DatabaseProbe(engine, ttl=0, timeout=1).check()
+    assert result.error == "OSError"
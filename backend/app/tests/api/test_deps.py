@@ -0,0 +1,17 @@
+import pytest
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.api.deps import get_db
+
+
+async def test_get_db_commits() -> None:
+    sessions = get_db()
+    session = await anext(sessions)
+    commits: list[Session] = []
+    event.listen(session.sync_session, "after_commit", commits.append)
+    await session.execute(select(1))
+    with pytest.raises(StopAsyncIteration):
+        await anext(sessions)
+    # committed rather than rolled back, keeping the prepared statements
+    assert commits == [session.sync_session]
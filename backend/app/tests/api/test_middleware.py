@@ -0,0 +1,56 @@
+import logging
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api.middleware import route_query_stats
+from app.core.config import settings
+
+
+def test_server_timing_header(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    r = client.get(f"{settings.API_V1_STR}/users/me", headers=superuser_token_headers)
+    assert r.status_code == 200
+    timing = r.headers["server-timing"]
+    assert timing.startswith("db;dur=")
+    assert 'desc="1 queries"' in timing
+    assert "app;dur=" in timing
+
+
+def test_query_stats_per_route(
+    client: TestClient, superuser_token_headers: dict[str, str]
+) -> None:
+    route_query_stats.clear()
+    client.get(f"{settings.API_V1_STR}/users/me", headers=superuser_token_headers)
+    client.get(f"{settings.API_V1_STR}/users/me", headers=superuser_token_headers)
+    r = client.get(
+        f"{settings.API_V1_STR}/utils/query-stats/", headers=superuser_token_headers
+    )
+    assert r.status_code == 200
+    stats = r.json()[f"GET {settings.API_V1_STR}/users/me"]
+    assert stats["requests"] == 2
+    assert stats["queries"] == 2
+    assert stats["max_queries"] == 1
+    assert stats["slowest_statement"].startswith("SELECT")
+    assert stats["threshold_exceeded"] == 0
+
+
+def test_query_count_threshold_warning(
+    client: TestClient,
+    superuser_token_headers: dict[str, str],
+    monkeypatch: pytest.MonkeyPatch,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    route_query_stats.clear()
+    url = f"{settings.API_V1_STR}/users/"
+    monkeypatch.setattr(settings, "DB_QUERY_COUNT_WARNING_THRESHOLD", 0)
+    with caplog.at_level(logging.WARNING, logger="app.api.middleware"):
+        client.get(url, headers=superuser_token_headers)
+    assert not caplog.records
+
+    monkeypatch.setattr(settings, "DB_QUERY_COUNT_WARNING_THRESHOLD", 1)
+    with caplog.at_level(logging.WARNING, logger="app.api.middleware"):
+        client.get(url, headers=superuser_token_headers)
+    assert "possible N+1 queries" in caplog.text
+    assert route_query_stats[f"GET {url}"].threshold_exceeded == 1
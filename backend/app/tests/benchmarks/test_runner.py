@@ -0,0 +1,57 @@
+import httpx
+
+from app.benchmarks.runner import Scenario, percentile, run_scenario
+from app.core.config import settings
+from app.main import app
+
+
+def test_percentile() -> None:
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile(values, 100) == 100
+    assert percentile([], 95) == 0.0
+
+
+async def test_run_scenario() -> None:
+    async def health_check(client: httpx.AsyncClient, _: int) -> httpx.Response:
+        return await client.get(f"{settings.API_V1_STR}/utils/health-check/")
+
+    transport = httpx.ASGITransport(app=app)
+    async with (
+        app.router.lifespan_context(app),
+        httpx.AsyncClient(transport=transport, base_url="http://test") as client,
+    ):
+        result = await run_scenario(
+            client,
+            Scenario("health_check", health_check),
+            requests=20,
+            concurrency=4,
+            count_queries=True,
+        )
+    assert result.requests == 20
+    assert result.errors == 0
+    assert result.status_codes == {"200": 20}
+    assert result.queries_per_request == 0
+    assert result.latency_ms["p50"] <= result.latency_ms["max"]
+
+
+async def test_run_scenario_prepare() -> None:
+    calls: list[str] = []
+
+    async def prepare(_: httpx.AsyncClient, total: int) -> None:
+        calls.append(f"prepare {total}")
+
+    async def request(_: httpx.AsyncClient, i: int) -> httpx.Response:
+        calls.append(f"request {i}")
+        return httpx.Response(200)
+
+    async with httpx.AsyncClient() as client:
+        await run_scenario(
+            client,
+            Scenario("prepared", request, requests=2, prepare=prepare),
+            requests=10,
+            concurrency=1,
+            count_queries=False,
+        )
+    assert calls == ["prepare 2", "request 0", "request 1"]
@@ -0,0 +1,34 @@
+import json
+from typing import Any
+
+from pydantic import BaseModel
+
+from app.api.responses import FastJSONResponse
+from app.api.routes.items import item_list_adapter
+from app.api.routes.users import user_list_adapter
+from app.benchmarks.serialization import build_paths, main, make_items, make_users
+from app.schemas.item import ItemPublic, ItemsPublic
+from app.schemas.user import UserPublic, UsersPublic
+
+
+async def test_serialization_paths_match() -> None:
+    datasets: list[tuple[list[Any], type[BaseModel], type[BaseModel], Any]] = [
+        (make_items(3), ItemPublic, ItemsPublic, item_list_adapter),
+        (make_users(3), UserPublic, UsersPublic, user_list_adapter),
+    ]
+    for rows, schema, page, adapter in datasets:
+        paths = build_paths(schema, page, adapter)
+        bodies = [json.loads(await serialize(rows)) for serialize in paths.values()]
+        assert bodies[0]["count"] == 3
+        assert len(bodies[0]["data"]) == 3
+        assert all(body == bodies[0] for body in bodies)
+
+
+async def test_serialization_benchmark_runs() -> None:
+    await main(["--rows", "2", "--iterations", "1"])
+
+
+def test_fast_json_response() -> None:
+    response = FastJSONResponse({"name": "ünï", "values": [1, None]})
+    assert response.body == '{"name":"ünï","values":[1,null]}'.encode()
+    assert response.media_type == "application/json"
@@ -0,0 +1,43 @@
+import subprocess
+import sys
+
+import pytest
+
+from app.benchmarks.startup import by_package, main, parse_importtime
+
+REPORT = """\
+import time: self [us] | cumulative | imported package
+import time:       100 |        100 |     pydantic.fields
+import time:        50 |        150 |   pydantic
+import time:       200 |        350 | app.main
+some unrelated output
+"""
+
+
+def test_parse_importtime() -> None:
+    entries = parse_importtime(REPORT)
+    assert [entry.module for entry in entries] == [
+        "pydantic.fields",
+        "pydantic",
+        "app.main",
+    ]
+    assert entries[-1].cumulative_us == 350
+    assert by_package(entries) == {"app": 200, "pydantic": 150}
+
+
+def test_optional_components_not_imported() -> None:
+    code = (
+        "import sys, app.main; "
+        "print(sorted(m for m in ('sentry_sdk', 'passlib') if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == "[]"
+
+
+@pytest.mark.parametrize("runs", ["0", "-1"])
+def test_runs_must_be_positive(runs: str, capsys: pytest.CaptureFixture[str]) -> None:
+    with pytest.raises(SystemExit):
+        main(["--runs", runs])
+    assert "must be at least 1" in capsys.readouterr().err
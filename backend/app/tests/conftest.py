@@ -8,6 +8,7 @@ from sqlalchemy import delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
+from app.core.security import API_KEY_PREFIX_LENGTH, hash_api_key
 from app.db.init_db import init_db
 from app.db.session import AsyncSessionLocal
 from app.main import app
@@ -33,7 +34,8 @@ async def db() -> AsyncGenerator[AsyncSession, None]:
 async def api_key_header(db: AsyncSession) -> dict[str, str]:
     key_value = str(uuid.uuid4())
     api_key = APIKey(
-        key=key_value,
+        key_hash=hash_api_key(key_value),
+        key_prefix=key_value[:API_KEY_PREFIX_LENGTH],
         name="Test Key",
         expires_at=datetime.now() + timedelta(days=1),
     )
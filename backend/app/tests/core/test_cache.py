@@ -0,0 +1,105 @@
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from contextlib import suppress
+from typing import Any
+
+import pytest
+
+from app.core.cache import RedisInvalidations, TTLCache
+
+
+def test_cache_get_set() -> None:
+    cache: TTLCache[str, int] = TTLCache(maxsize=10, ttl=60)
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("b", -1) == -1
+
+
+def test_cache_lru_eviction() -> None:
+    cache: TTLCache[str, int] = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+
+def test_cache_ttl_expiry(monkeypatch: pytest.MonkeyPatch) -> None:
+    cache: TTLCache[str, int] = TTLCache(maxsize=10, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2, ttl=5)
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 10)
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+
+
+def test_cache_invalidate() -> None:
+    cache: TTLCache[str, int | None] = TTLCache(maxsize=10, ttl=60)
+    cache.set("a", None)
+    assert cache.get("a", -1) is None
+    cache.invalidate("a")
+    assert cache.get("a", -1) == -1
+
+
+class FakePubSub:
+    def __init__(self, broker: "FakeRedis") -> None:
+        self.broker = broker
+        self.messages: asyncio.Queue[dict[str, Any]] = asyncio.Queue()
+
+    async def __aenter__(self) -> "FakePubSub":
+        return self
+
+    async def __aexit__(self, *_: Any) -> None:
+        self.broker.subscribers.remove(self)
+
+    async def subscribe(self, _channel: str) -> None:
+        self.broker.subscribers.append(self)
+        await self.messages.put({"type": "subscribe", "data": 1})
+
+    async def listen(self) -> AsyncIterator[dict[str, Any]]:
+        while True:
+            yield await self.messages.get()
+
+
+class FakeRedis:
+    """The pub/sub part of redis.asyncio.Redis, for a single channel."""
+
+    def __init__(self) -> None:
+        self.subscribers: list[FakePubSub] = []
+
+    def pubsub(self) -> FakePubSub:
+        return FakePubSub(self)
+
+    async def publish(self, _channel: str, message: str) -> None:
+        for subscriber in self.subscribers:
+            await subscriber.messages.put({"type": "message", "data": message.encode()})
+
+
+async def test_redis_invalidations() -> None:
+    redis = FakeRedis()
+    # two workers, each with its own cache
+    caches: list[TTLCache[str, Any]] = [TTLCache(maxsize=10, ttl=60) for _ in range(2)]
+    workers = [RedisInvalidations(redis, "keys", cache) for cache in caches]
+    tasks = [asyncio.create_task(worker.run()) for worker in workers]
+    try:
+        while len(redis.subscribers) < 2:
+            await asyncio.sleep(0)
+        for cache in caches:
+            cache.set("a", 1)
+            cache.set("b", 2)
+
+        await workers[0].invalidate("a")
+        await asyncio.sleep(0.01)
+        assert [cache.get("a") for cache in caches] == [None, None]
+        assert [cache.get("b") for cache in caches] == [2, 2]
+    finally:
+        for task in tasks:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
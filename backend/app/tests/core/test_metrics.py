@@ -0,0 +1,53 @@
+import json
+import os
+from pathlib import Path
+
+from app.core.metrics import (
+    MetricsRegistry,
+    MultiprocessStore,
+    merge_snapshots,
+    render_text,
+)
+
+
+def _registry(requests: float, in_flight: float) -> MetricsRegistry:
+    registry = MetricsRegistry()
+    registry.counter("requests_total", "Requests").inc(requests, route="items")
+    registry.gauge("in_flight", "In flight", callback=lambda: in_flight)
+    registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0)).observe(
+        0.5, route="items"
+    )
+    return registry
+
+
+def test_render_text() -> None:
+    snapshot = _registry(3, 2).snapshot()
+    text = render_text(merge_snapshots([snapshot], {snapshot["pid"]}))
+    assert "# TYPE requests_total counter" in text
+    assert 'requests_total{route="items"} 3' in text
+    assert "in_flight 2" in text
+    assert 'latency_seconds_bucket{route="items",le="0.1"} 0' in text
+    assert 'latency_seconds_bucket{route="items",le="1"} 1' in text
+    assert 'latency_seconds_bucket{route="items",le="+Inf"} 1' in text
+    assert 'latency_seconds_count{route="items"} 1' in text
+
+
+def test_merge_snapshots_across_workers() -> None:
+    live = _registry(3, 2).snapshot() | {"pid": 1}
+    exited = _registry(4, 5).snapshot() | {"pid": 2}
+    text = render_text(merge_snapshots([live, exited], {1}))
+    # counters and histograms of exited workers are kept, gauges are not
+    assert 'requests_total{route="items"} 7' in text
+    assert 'latency_seconds_count{route="items"} 2' in text
+    assert "in_flight 2" in text
+
+
+def test_multiprocess_store(tmp_path: Path) -> None:
+    other_worker = _registry(4, 5).snapshot() | {"pid": os.getppid()}
+    (tmp_path / "other.json").write_text(json.dumps(other_worker))
+
+    store = MultiprocessStore(_registry(3, 2), str(tmp_path), sync_interval=60)
+    text = store.collect()
+    assert (tmp_path / f"{os.getpid()}.json").exists()
+    assert 'requests_total{route="items"} 7' in text
+    assert "in_flight 7" in text
@@ -0,0 +1,27 @@
+import pytest
+
+from app.core.rate_limit import MemoryRateLimitBackend
+
+
+async def test_memory_token_bucket() -> None:
+    now = 1000.0
+    backend = MemoryRateLimitBackend(maxsize=10, clock=lambda: now)
+
+    results = [await backend.acquire("key", per_minute=3) for _ in range(4)]
+    assert [r.allowed for r in results] == [True, True, True, False]
+    assert [r.remaining for r in results] == [2, 1, 0, 0]
+    assert results[-1].retry_after == pytest.approx(20)
+    assert results[-1].headers()["Retry-After"] == "20"
+    # other keys have their own bucket
+    assert (await backend.acquire("other", per_minute=3)).allowed
+
+    # one token back every 20 seconds
+    now += 20
+    assert (await backend.acquire("key", per_minute=3)).allowed
+    assert not (await backend.acquire("key", per_minute=3)).allowed
+
+    # never refills above the limit
+    now += 3600
+    result = await backend.acquire("key", per_minute=3)
+    assert result.remaining == 2
+    assert result.headers()["X-RateLimit-Reset"] == "20"
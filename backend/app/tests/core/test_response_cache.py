@@ -0,0 +1,64 @@
+from starlette.requests import Request
+
+from app.core.response_cache import (
+    CachedResponse,
+    MemoryBackend,
+    ResponseCache,
+    etag_matches,
+)
+
+
+def _request(query: str = "", if_none_match: str | None = None) -> Request:
+    headers = []
+    if if_none_match is not None:
+        headers.append((b"if-none-match", if_none_match.encode()))
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "path": "/items/",
+            "query_string": query.encode(),
+            "headers": headers,
+        }
+    )
+
+
+def test_etag_matches() -> None:
+    assert etag_matches(_request(if_none_match='"a", "b"'), '"b"')
+    assert etag_matches(_request(if_none_match='W/"b"'), '"b"')
+    assert etag_matches(_request(if_none_match="*"), '"b"')
+    assert not etag_matches(_request(if_none_match='"a"'), '"b"')
+    assert not etag_matches(_request(), '"b"')
+
+
+async def test_response_cache() -> None:
+    cache = ResponseCache(MemoryBackend(maxsize=10, ttl=30), namespace="t", ttl=30)
+    builds = 0
+
+    async def build() -> CachedResponse:
+        nonlocal builds
+        builds += 1
+        return CachedResponse(etag=f'"{builds}"', body=b"{}")
+
+    r = await cache.respond(_request("b=2&a=1"), build)
+    assert r.status_code == 200
+    assert r.headers["etag"] == '"1"'
+    # same parameters in another order hit the same entry
+    r = await cache.respond(_request("a=1&b=2", if_none_match='"1"'), build)
+    assert r.status_code == 304
+    assert builds == 1
+
+    await cache.invalidate()
+    r = await cache.respond(_request("a=1&b=2"), build)
+    assert r.headers["etag"] == '"2"'
+    assert builds == 2
+
+
+async def test_response_cache_without_backend() -> None:
+    cache = ResponseCache(None, namespace="t", ttl=30)
+
+    async def build() -> CachedResponse:
+        return CachedResponse(etag='"1"', body=b"{}")
+
+    r = await cache.respond(_request(if_none_match='"1"'), build)
+    assert r.status_code == 304
@@ -0,0 +1,55 @@
+import asyncio
+from typing import Any
+
+import pytest
+
+from app.core.config import Settings
+from app.core.security import PasswordHasher, verify_password
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+async def test_password_hasher_hash_and_verify(executor: str) -> None:
+    hasher = PasswordHasher(executor=executor, max_workers=1)  # type: ignore[arg-type]
+    try:
+        hashed = await hasher.hash("s3cret-password")
+        assert verify_password("s3cret-password", hashed)
+        assert await hasher.verify("s3cret-password", hashed)
+        assert not await hasher.verify("wrong-password", hashed)
+    finally:
+        hasher.shutdown()
+
+
+async def test_password_hasher_queue_depth() -> None:
+    hasher = PasswordHasher(executor="thread", max_workers=1)
+    try:
+        tasks = [asyncio.create_task(hasher.hash("s3cret-password")) for _ in range(3)]
+        await asyncio.sleep(0)
+        assert hasher.in_flight == 3
+        assert hasher.queue_depth == 2
+        await asyncio.gather(*tasks)
+        assert hasher.in_flight == 0
+        assert hasher.queue_depth == 0
+    finally:
+        hasher.shutdown()
+
+
+def test_api_key_secret_required(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("SECRET_KEY", raising=False)
+    monkeypatch.delenv("API_KEY_PEPPER", raising=False)
+    required: dict[str, Any] = {
+        "_env_file": None,
+        "PROJECT_NAME": "test",
+        "POSTGRES_SERVER": "db",
+        "POSTGRES_USER": "user",
+        "FIRST_SUPERUSER": "admin@example.com",
+        "FIRST_SUPERUSER_PASSWORD": "password",
+        "EMAIL_TEST_USER": "test@example.com",
+    }
+
+    with pytest.raises(ValueError, match="API_KEY_PEPPER"):
+        Settings(ENVIRONMENT="production", **required)
+    with pytest.warns(UserWarning, match="API_KEY_PEPPER"):
+        Settings(ENVIRONMENT="local", **required)
+    # either secret makes the hashes stable
+    Settings(ENVIRONMENT="production", SECRET_KEY="k", **required)
+    Settings(ENVIRONMENT="production", API_KEY_PEPPER="p", **required)
@@ -0,0 +1,105 @@
+import uuid
+from collections.abc import AsyncIterator
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.crud.item import item_crud
+from app.schemas.item import ItemCreate, ItemUpdate
+from app.tests.utils.item import create_random_item
+
+
+async def test_count_strategies(db: AsyncSession) -> None:
+    await create_random_item(db)
+    exact = await item_crud.count(db, strategy="exact")
+    assert exact >= 1
+    # falls back to an exact count until the table has been analyzed
+    assert await item_crud.count(db, strategy="estimated") >= 0
+
+
+async def test_cached_count_invalidated_on_create_and_remove(
+    db: AsyncSession,
+) -> None:
+    before = await item_crud.count(db, strategy="cached")
+    item = await create_random_item(db)
+    assert await item_crud.count(db, strategy="cached") == before + 1
+    await item_crud.remove(db, item.id)
+    assert await item_crud.count(db, strategy="cached") == before
+
+
+async def test_update_by_id(db: AsyncSession) -> None:
+    item = await create_random_item(db)
+    updated = await item_crud.update_by_id(db, item.id, ItemUpdate(title="New title"))
+    assert updated
+    assert updated.id == item.id
+    assert updated.title == "New title"
+    assert updated.description == item.description
+    assert updated.date_updated >= item.date_created
+
+
+async def test_update_by_id_not_found(db: AsyncSession) -> None:
+    assert await item_crud.update_by_id(db, uuid.uuid4(), ItemUpdate(title="x")) is None
+
+
+async def test_remove(db: AsyncSession) -> None:
+    item = await create_random_item(db)
+    removed = await item_crud.remove(db, item.id)
+    assert removed
+    assert removed.id == item.id
+    assert await item_crud.get(db, item.id) is None
+    assert await item_crud.remove(db, item.id) is None
+
+
+async def test_search(db: AsyncSession) -> None:
+    exact = await item_crud.create(
+        db, ItemCreate(title="widget", description="the original")
+    )
+    in_description = await item_crud.create(
+        db, ItemCreate(title="gadget", description="works with any widget")
+    )
+    prefixed = await item_crud.create(db, ItemCreate(title="widgetry guide"))
+    await item_crud.create(db, ItemCreate(title="unrelated"))
+
+    items, next_cursor = await item_crud.search(db, "widget")
+    assert next_cursor is None
+    assert items[0].id == exact.id
+    assert {item.id for item in items} == {exact.id, in_description.id, prefixed.id}
+
+    # prefix and typo matches on the title
+    items, _ = await item_crud.search(db, "widg")
+    assert {item.id for item in items} == {exact.id, prefixed.id}
+    items, _ = await item_crud.search(db, "widgit")
+    assert exact.id in {item.id for item in items}
+
+
+async def test_search_pagination(db: AsyncSession) -> None:
+    for i in range(5):
+        await item_crud.create(db, ItemCreate(title=f"lamp {i}"))
+    seen: list[uuid.UUID] = []
+    cursor = None
+    while True:
+        items, cursor = await item_crud.search(db, "lamp", limit=2, cursor=cursor)
+        seen.extend(item.id for item in items)
+        if cursor is None:
+            break
+    assert len(seen) == 5
+    assert len(set(seen)) == 5
+
+
+async def test_copy_many(db: AsyncSession) -> None:
+    title = f"copy-{uuid.uuid4()}"
+
+    async def batches() -> AsyncIterator[list[ItemCreate]]:
+        yield [ItemCreate(title=title, description=str(i)) for i in range(2)]
+        yield [ItemCreate(title=title, description="2")]
+
+    assert await item_crud.copy_many(db, batches()) == 3
+    await db.commit()
+    items = await item_crud.get_by_title(db, title)
+    assert sorted(item.description for item in items) == ["0", "1", "2"]
+    assert all(item.date_created == item.date_updated for item in items)
+
+
+async def test_get_page_empty_limit(db: AsyncSession) -> None:
+    await create_random_item(db)
+    assert await item_crud.get_page(db, limit=0) == ([], None)
+    assert await item_crud.search(db, "item", limit=0) == ([], None)
@@ -91,3 +91,17 @@ async def test_update_user(db: AsyncSession) -> None:
     assert user_2
     assert user.email == user_2.email
     assert verify_password(new_password, user_2.hashed_password)
+
+
+async def test_revoke_token_version(db: AsyncSession) -> None:
+    user_in = UserCreate(email=random_email(), password=random_lower_string())
+    user = await user_crud.create(db, user_in)
+    assert await user_crud.get_token_version(db, user.id) == 0
+
+    await user_crud.update(db, user, UserUpdate(full_name="Renamed"))
+    assert await user_crud.get_token_version(db, user.id) == 0
+    await user_crud.update(db, user, UserUpdate(is_active=False))
+    assert await user_crud.get_token_version(db, user.id) == 1
+
+    await user_crud.remove(db, user.id)
+    assert await user_crud.get_token_version(db, user.id) is None
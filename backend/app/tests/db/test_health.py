@@ -0,0 +1,25 @@
+import pytest
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.db.health import ping
+from app.db.session import _create_engine
+from app.db.warmup import warm_up_engine
+
+
+@pytest.mark.skipif(
+    settings.DB_PREPARE_THRESHOLD is None, reason="statements are never prepared"
+)
+async def test_ping_keeps_prepared_statements() -> None:
+    db_engine = _create_engine(settings.SQLALCHEMY_DATABASE_URI)
+    try:
+        await warm_up_engine(db_engine, 1)
+        await ping(db_engine)
+        # the pool hands back the same, only connection
+        async with db_engine.connect() as conn:
+            prepared = await conn.scalar(
+                text("SELECT count(*) FROM pg_prepared_statements")
+            )
+        assert prepared
+    finally:
+        await db_engine.dispose()
@@ -0,0 +1,126 @@
+from collections.abc import AsyncGenerator, Callable
+from typing import Any
+
+import pytest_asyncio
+from alembic.operations import Operations
+from alembic.runtime.migration import MigrationContext
+from sqlalchemy import Connection, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from app.core.config import settings
+from app.db.migrations import (
+    ProgressReporter,
+    batched_update,
+    create_index_concurrently,
+    drop_index_concurrently,
+)
+from app.db.session import _create_engine
+
+
+@pytest_asyncio.fixture
+async def conn(db: AsyncSession) -> AsyncGenerator[AsyncConnection, None]:
+    # CREATE INDEX CONCURRENTLY waits for every open transaction
+    await db.commit()
+    db_engine = _create_engine(settings.SQLALCHEMY_DATABASE_URI)
+    async with db_engine.connect() as conn:
+        await conn.execute(
+            text(
+                "CREATE TABLE migration_test"
+                " (id integer PRIMARY KEY, value integer NOT NULL)"
+            )
+        )
+        await conn.execute(
+            text(
+                "INSERT INTO migration_test"
+                " SELECT i, i % 3 FROM generate_series(1, 25) AS i"
+            )
+        )
+        await conn.commit()
+        try:
+            yield conn
+        finally:
+            await conn.rollback()
+            await conn.execute(text("DROP TABLE migration_test"))
+            await conn.commit()
+    await db_engine.dispose()
+
+
+async def migrate(conn: AsyncConnection, fn: Callable[[], Any]) -> Any:
+    """Run ``fn`` as a revision script would, with ``op`` bound to ``conn``."""
+
+    def run(sync_conn: Connection) -> Any:
+        context = MigrationContext.configure(sync_conn)
+        with Operations.context(context), context.begin_transaction():
+            return fn()
+
+    # alembic starts outside a transaction
+    await conn.commit()
+    return await conn.run_sync(run)
+
+
+def test_progress_reporter() -> None:
+    messages: list[str] = []
+    progress = ProgressReporter("backfill", total=10, interval=0, log=messages.append)
+    progress.update(4)
+    progress.update(6)
+    progress.finish()
+    assert messages[0].startswith("backfill: 4/10 rows (40%) in ")
+    assert messages[-1].startswith("backfill: 10/10 rows (100%) in ")
+    assert messages[-1].endswith(", done")
+
+
+async def test_batched_update(conn: AsyncConnection) -> None:
+    messages: list[str] = []
+    updated = await migrate(
+        conn,
+        lambda: batched_update(
+            "migration_test",
+            "value = value + :step",
+            "value = 0",
+            batch_size=3,
+            params={"step": 10},
+            progress=ProgressReporter("backfill", interval=0, log=messages.append),
+        ),
+    )
+    # ids 3, 6 ... 24
+    assert updated == 8
+    # one message per batch, plus the final one
+    assert len(messages) == 4
+    rows = (await conn.execute(text("SELECT id, value FROM migration_test"))).all()
+    assert {id_ for id_, value in rows if value == 10} == set(range(3, 25, 3))
+    assert not any(value == 0 for _, value in rows)
+
+
+async def test_create_index_concurrently(conn: AsyncConnection) -> None:
+    def valid_indexes() -> Any:
+        return conn.scalars(
+            text(
+                "SELECT indisvalid FROM pg_index"
+                " WHERE indexrelid = to_regclass('ix_migration_test_value')"
+            )
+        )
+
+    create = lambda: create_index_concurrently(  # noqa: E731
+        "ix_migration_test_value", "migration_test", ["value"]
+    )
+    await migrate(conn, create)
+    # a rerun keeps the existing index
+    await migrate(conn, create)
+    assert (await valid_indexes()).all() == [True]
+
+    # as left behind by a failed build
+    await conn.execute(
+        text(
+            "UPDATE pg_index SET indisvalid = false"
+            " WHERE indexrelid = 'ix_migration_test_value'::regclass"
+        )
+    )
+    await conn.commit()
+    await migrate(conn, create)
+    assert (await valid_indexes()).all() == [True]
+
+    await migrate(
+        conn,
+        lambda: drop_index_concurrently("ix_migration_test_value", "migration_test"),
+    )
+    assert (await valid_indexes()).all() == []
@@ -0,0 +1,69 @@
+import pytest
+from sqlalchemy import insert, select
+
+from app.core.config import settings
+from app.db import session as db_session
+from app.db.session import (
+    AsyncReadSessionLocal,
+    ReplicaRouter,
+    _create_engine,
+    connect_read_session,
+    engine,
+)
+from app.models.item import Item
+
+
+def _replica_url(port: int) -> str:
+    uri = settings.SQLALCHEMY_DATABASE_URI
+    return (
+        f"postgresql+psycopg://{settings.POSTGRES_USER}:{settings.POSTGRES_PASSWORD}"
+        f"@{uri.hosts()[0]['host']}:{port}/{settings.POSTGRES_DB}"
+    )
+
+
+async def test_replica_router_round_robin_and_failover() -> None:
+    replicas = [_create_engine(_replica_url(5433)), _create_engine(_replica_url(5434))]
+    router = ReplicaRouter(replicas)
+    try:
+        chosen = [router.choose() for _ in range(4)]
+        assert chosen == [replicas[0], replicas[1], replicas[0], replicas[1]]
+
+        router.mark_failed(replicas[0])
+        assert {router.choose() for _ in range(3)} == {replicas[1]}
+
+        router.mark_failed(replicas[1])
+        assert router.choose() is None
+    finally:
+        for replica in replicas:
+            await replica.dispose()
+
+
+async def test_read_session_routing(monkeypatch: pytest.MonkeyPatch) -> None:
+    replica = _create_engine(settings.SQLALCHEMY_DATABASE_URI)
+    monkeypatch.setattr(db_session, "replica_router", ReplicaRouter([replica]))
+    try:
+        async with AsyncReadSessionLocal() as session:
+            assert await connect_read_session(session)
+            sync_session = session.sync_session
+            assert sync_session.get_bind(clause=select(Item)) is replica.sync_engine
+
+            await session.execute(insert(Item).values(title="routed"))
+            # reads after a write stick to the primary
+            assert sync_session.get_bind(clause=select(Item)) is engine.sync_engine
+            await session.rollback()
+    finally:
+        await replica.dispose()
+
+
+async def test_read_session_falls_back_to_primary(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    replica = _create_engine(_replica_url(1))
+    router = ReplicaRouter([replica])
+    monkeypatch.setattr(db_session, "replica_router", router)
+    try:
+        async with AsyncReadSessionLocal() as session:
+            assert not await connect_read_session(session)
+        assert router.choose() is None
+    finally:
+        await replica.dispose()
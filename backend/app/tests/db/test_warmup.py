@@ -0,0 +1,62 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import text, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.security import hash_api_key
+from app.crud.api_key import api_key_cache
+from app.db.session import _create_engine
+from app.db.warmup import (
+    COUNT_QUERIES,
+    HOT_QUERIES,
+    _hot_queries,
+    warm_up_caches,
+    warm_up_engine,
+)
+from app.models.api_key import APIKey
+
+
+async def test_warm_up_engine() -> None:
+    db_engine = _create_engine(settings.SQLALCHEMY_DATABASE_URI)
+    try:
+        await warm_up_engine(db_engine, 2)
+        assert db_engine.pool.checkedin() == 2  # type: ignore[attr-defined]
+        async with db_engine.connect() as conn:
+            prepared = await conn.scalar(
+                text("SELECT count(*) FROM pg_prepared_statements")
+            )
+        if settings.DB_PREPARE_THRESHOLD is not None:
+            assert prepared
+        # no connection was opened beyond the warmed ones
+        assert db_engine.pool.checkedin() == 2  # type: ignore[attr-defined]
+    finally:
+        await db_engine.dispose()
+
+
+def test_count_queries_primed_when_estimated(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "LIST_COUNT_STRATEGY", "exact")
+    assert _hot_queries() == HOT_QUERIES
+    monkeypatch.setattr(settings, "LIST_COUNT_STRATEGY", "estimated")
+    assert _hot_queries() == HOT_QUERIES + COUNT_QUERIES
+
+
+async def test_warm_up_caches(
+    db: AsyncSession,
+    api_key_header: dict[str, str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    key_hash = hash_api_key(api_key_header["X-API-Key"])
+    await db.execute(
+        update(APIKey)
+        .where(APIKey.key_hash == key_hash)
+        .values(last_used_at=datetime.now() + timedelta(minutes=1))
+    )
+    await db.commit()
+    monkeypatch.setattr(settings, "API_KEY_CACHE_WARMUP_SIZE", 1)
+    api_key_cache.clear()
+    await warm_up_caches()
+    key_obj = api_key_cache.get(key_hash)
+    assert key_obj is not None
+    assert key_obj.name == "Test Key"
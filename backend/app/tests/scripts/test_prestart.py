@@ -0,0 +1,58 @@
+import asyncio
+from collections.abc import AsyncGenerator
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app import prestart
+from app.core.config import settings
+from app.db.session import _create_engine
+from app.prestart import migration_lock, run_migrations
+
+
+@pytest_asyncio.fixture
+async def db_engine() -> AsyncGenerator[AsyncEngine, None]:
+    db_engine = _create_engine(settings.SQLALCHEMY_DATABASE_URI)
+    yield db_engine
+    await db_engine.dispose()
+
+
+async def advisory_locks(db_engine: AsyncEngine) -> int:
+    async with db_engine.connect() as conn:
+        count = await conn.scalar(
+            text("SELECT count(*) FROM pg_locks WHERE locktype = 'advisory'")
+        )
+    return int(count or 0)
+
+
+async def test_run_migrations_at_head(db_engine: AsyncEngine) -> None:
+    async with db_engine.connect() as conn:
+        before = await conn.scalar(text("SELECT version_num FROM alembic_version"))
+    async with migration_lock(db_engine) as conn:
+        assert await advisory_locks(db_engine) == 1
+        await run_migrations(conn)
+    async with db_engine.connect() as conn:
+        after = await conn.scalar(text("SELECT version_num FROM alembic_version"))
+    assert after == before
+    assert await advisory_locks(db_engine) == 0
+
+
+async def test_migration_lock_is_exclusive(
+    db_engine: AsyncEngine, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(prestart, "MIGRATION_LOCK_POLL_SECONDS", 0.01)
+    order: list[str] = []
+
+    async def hold(name: str) -> None:
+        async with migration_lock(db_engine):
+            order.append(f"{name} locked")
+            await asyncio.sleep(0.1)
+            order.append(f"{name} released")
+
+    await asyncio.gather(hold("first"), hold("second"))
+    # the holders never overlap
+    assert order[0].endswith("locked") and order[1].endswith("released")
+    assert order[2].endswith("locked") and order[3].endswith("released")
+    assert await advisory_locks(db_engine) == 0